@@ -1,10 +1,569 @@
 import random
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from copy import deepcopy
+from multiprocessing import shared_memory
+
+import numpy
 
 from errors import GraphException
 
 MAX_GRAPH_COST = 100  # We use this for the costs of the randomly generated graphs
 INFINITY = 999999999999999  # We use this to define the default value used as infinity
+WORD_SIZE = 64  # The number of sources processed together by the bit-parallel BFS (one bit per source)
+BOTTOM_UP_ALPHA = 14  # Go bottom-up once the frontier edges exceed 1/ALPHA of the unvisited vertices' edges
+BOTTOM_UP_BETA = 24  # Go back top-down once the frontier has less than 1/BETA of all the vertices
+SMALL_SCC_TASK = 2048  # Parts of the graph with at most this many vertices are solved by a worker on its own
+TRIM_ROUNDS = 3  # How many times the vertices without inbound/outbound neighbours are trimmed in every FB step
+CLOSURE_LIMIT = 8192  # Condensations with at most this many components get a full transitive closure (bitsets)
+INTERVAL_LABELINGS = 2  # The number of interval labelings used for the larger condensations
+
+
+class CSRView:
+    def __init__(self, vertices, offsets, targets, costs):
+        """
+        Compressed sparse row (CSR) view of the edges of a graph. The vertices are renumbered densely as
+        0, 1, ..., n - 1 in the order given by <vertices>; the neighbours (as indices) of the vertex with index i are
+        targets[offsets[i]:offsets[i + 1]] and the costs of those edges are costs[offsets[i]:offsets[i + 1]].
+        :param vertices: The vertices of the graph; list (index -> vertex)
+        :param offsets: The start of the neighbour list of each vertex; numpy array of n + 1 integers
+        :param targets: The neighbour indices of all the vertices, concatenated; numpy array of integers
+        :param costs: The costs of the edges, in the same order as <targets>; numpy array
+        """
+        self.vertices = vertices
+        self.index = {vertex: i for i, vertex in enumerate(vertices)}
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+
+    def get_no_vertices(self):
+        """
+        Returns the number of vertices in the view.
+        """
+        return len(self.vertices)
+
+    def get_degrees(self):
+        """
+        Returns the number of neighbours of every vertex index; numpy array of integers
+        """
+        return numpy.diff(self.offsets)
+
+    def get_sources(self):
+        """
+        Returns the index of the vertex each entry of <targets> belongs to (i.e., the other end of every edge of
+        the view); numpy array of integers
+        """
+        return numpy.repeat(numpy.arange(len(self.vertices), dtype=numpy.int64), self.get_degrees())
+
+
+class CondensedGraph:
+    def __init__(self, vertices, component, offsets, targets, min_cost, max_cost, sum_cost):
+        """
+        The condensation of a directed graph: a Directed Acyclic Graph with a vertex for every strongly connected
+        component of the original graph and an edge between 2 components if there is at least one edge between
+        their vertices in the original graph. The components are numbered 0, 1, ..., k - 1 in topological order
+        and the edges are kept in CSR format (see CSRView): the components reachable by a single edge from the
+        component c are targets[offsets[c]:offsets[c + 1]]. For every such edge, the minimum, maximum and the sum
+        of the costs of the original edges it replaces are kept in min_cost, max_cost and sum_cost.
+        The class offers the traversal methods of the graphs from Assignment 4 (get_all_vertices,
+        get_inbound_neighbours, etc.), so the DAG algorithms written there can be run on it directly.
+        :param vertices: The vertices of the original graph; list (index -> vertex)
+        :param component: The component of every vertex of the original graph; numpy array (index -> component)
+        :param offsets: numpy array of k + 1 integers
+        :param targets: numpy array of integers
+        :param min_cost: numpy array, with the same length as <targets>
+        :param max_cost: numpy array, with the same length as <targets>
+        :param sum_cost: numpy array, with the same length as <targets>
+        """
+        self.vertices = vertices
+        self.index = {vertex: i for i, vertex in enumerate(vertices)}
+        self.component = component
+        self.offsets = offsets
+        self.targets = targets
+        self.min_cost = min_cost
+        self.max_cost = max_cost
+        self.sum_cost = sum_cost
+        self.sizes = numpy.bincount(component, minlength=len(offsets) - 1)
+        # The inbound edges, obtained by stably sorting the outbound ones by their ending component
+        self.in_edges = numpy.argsort(targets, kind="stable")
+        self.in_sources = numpy.repeat(numpy.arange(len(offsets) - 1), numpy.diff(offsets))[self.in_edges]
+        self.in_offsets = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(targets, minlength=len(offsets) - 1))))
+
+    def get_no_vertices(self):
+        """
+        Returns the number of components (vertices of the condensation).
+        """
+        return len(self.offsets) - 1
+
+    def get_no_edges(self):
+        """
+        Returns the number of edges between different components.
+        """
+        return len(self.targets)
+
+    def get_all_vertices(self):
+        """
+        Returns all the components using an iterator, in topological order.
+        """
+        for c in range(self.get_no_vertices()):
+            yield c
+
+    def is_vertex_in_graph(self, c):
+        """
+        Checks if the given component exists in the condensation or not.
+        """
+        return 0 <= c < self.get_no_vertices()
+
+    def __check_component(self, c):
+        """
+        Raises a GraphException if the given component does not exist.
+        """
+        if not self.is_vertex_in_graph(c):
+            raise GraphException(f"ERROR: The component {c} does not exist.")
+
+    def get_outbound_neighbours(self, c):
+        """
+        Returns the components which can be reached from the component <c> by a single edge using a generator.
+        :except: GraphException - if the given component does not exist
+        """
+        self.__check_component(c)
+        for neighbour in self.targets[self.offsets[c]:self.offsets[c + 1]].tolist():
+            yield neighbour
+
+    def get_inbound_neighbours(self, c):
+        """
+        Returns the components which reach the component <c> by a single edge using a generator.
+        :except: GraphException - if the given component does not exist
+        """
+        self.__check_component(c)
+        for neighbour in self.in_sources[self.in_offsets[c]:self.in_offsets[c + 1]].tolist():
+            yield neighbour
+
+    def get_edge_costs(self, _from, _to):
+        """
+        Returns the minimum, maximum and total cost of the original edges going from the component <_from> to the
+        component <_to>, as a tuple.
+        :except: GraphException - if there is no edge between the 2 components
+        """
+        self.__check_component(_from)
+        self.__check_component(_to)
+        start, end = self.offsets[_from], self.offsets[_from + 1]
+        position = start + numpy.searchsorted(self.targets[start:end], _to)
+        if position == end or self.targets[position] != _to:
+            raise GraphException(f"ERROR: There is no edge between the components {_from} and {_to}.")
+        return self.min_cost[position].item(), self.max_cost[position].item(), self.sum_cost[position].item()
+
+    def get_component_of(self, vertex):
+        """
+        Returns the component of the given vertex of the original graph.
+        :except: GraphException - if the vertex is not in the original graph
+        """
+        if vertex not in self.index:
+            raise GraphException(f"ERROR: The vertex {vertex} is not in the graph.")
+        return int(self.component[self.index[vertex]])
+
+    def get_component_vertices(self, c):
+        """
+        Returns the vertices of the original graph which form the component <c>; list
+        """
+        self.__check_component(c)
+        return [self.vertices[i] for i in numpy.flatnonzero(self.component == c).tolist()]
+
+    def topological_sort(self):
+        """
+        Returns the components sorted in topological order (which is simply their numbering).
+        """
+        return list(self.get_all_vertices())
+
+
+class GraphListener:
+    """
+    Base class for the objects which have to follow the changes of a graph (indexes, caches). A listener is
+    attached with TripleDictGraph.add_listener and each of the functions below is called right after the
+    corresponding change was made. By default, all the changes are ignored.
+    """
+
+    def on_vertex_added(self, vertex):
+        pass
+
+    def on_vertex_removed(self, vertex):
+        pass
+
+    def on_edge_added(self, _from, _to, cost):
+        pass
+
+    def on_edge_removed(self, _from, _to):
+        pass
+
+    def on_edge_cost_changed(self, _from, _to, old_cost, new_cost):
+        pass
+
+
+class SCCIndex(GraphListener):
+    def __init__(self, graph, max_updates=10000):
+        """
+        Keeps the strongly connected components of a graph up to date as the graph changes, so that the component
+        of a vertex can be found in O(1). Besides the component of every vertex, the index keeps the condensation
+        of the graph (see CondensedGraph) together with a topological order of its components.
+        Adding an edge is handled incrementally (Pearce-Kelly): if the edge goes forward in the topological order
+        nothing has to be done; otherwise only the components whose order is between the ends of the edge are
+        searched, the components on the newly closed cycles (if any) are merged and the components that were
+        found are reordered. Removing edges or vertices (which may split components) and too many incremental
+        updates only mark the index as outdated; it is then rebuilt from scratch by the next query.
+        :param graph: The graph; an instance of TripleDictGraph (the index attaches itself to it)
+        :param max_updates: The number of incremental updates after which the index is rebuilt from scratch
+        """
+        self.__graph = graph
+        self.__max_updates = max_updates
+        self.__outdated = True
+        self.__updates = 0
+        self.__component = {}
+        self.__members = {}
+        self.__order = {}
+        self.__out = {}
+        self.__in = {}
+        self.__next_component = 0
+        self.__next_position = 0
+        graph.add_listener(self)
+
+    def __rebuild(self):
+        """
+        Recomputes the whole index from the condensation of the graph, in O(V + E).
+        """
+        dag = self.__graph.condensation()
+        no_components = dag.get_no_vertices()
+        self.__component = dict(zip(dag.vertices, dag.component.tolist()))
+        self.__members = {c: [] for c in range(no_components)}
+        for vertex, c in self.__component.items():
+            self.__members[c].append(vertex)
+        # The components of the condensation are already numbered in topological order
+        self.__order = {c: c for c in range(no_components)}
+        self.__out = {c: set(dag.get_outbound_neighbours(c)) for c in range(no_components)}
+        self.__in = {c: set(dag.get_inbound_neighbours(c)) for c in range(no_components)}
+        self.__next_component = no_components
+        self.__next_position = no_components
+        self.__updates = 0
+        self.__outdated = False
+
+    def __ensure_up_to_date(self):
+        """
+        Rebuilds the index if it is outdated.
+        """
+        if self.__outdated:
+            self.__rebuild()
+
+    def component_of(self, vertex):
+        """
+        Returns the strongly connected component of the given vertex, as a number. Two vertices are in the same
+        component if and only if this function gives the same number for both of them.
+        :param vertex: A vertex of the graph; integer
+        :return: The component of <vertex>; integer
+        :except: GraphException - if the vertex is not in the graph
+        """
+        self.__ensure_up_to_date()
+        if vertex not in self.__component:
+            raise GraphException(f"ERROR: The vertex {vertex} is not in the graph.")
+        return self.__component[vertex]
+
+    def get_no_components(self):
+        """
+        Returns the number of strongly connected components of the graph.
+        """
+        self.__ensure_up_to_date()
+        return len(self.__members)
+
+    def get_components(self):
+        """
+        Returns all the strongly connected components of the graph as a list of lists of vertices; the components
+        are given in topological order.
+        """
+        self.__ensure_up_to_date()
+        return [list(self.__members[c]) for c in sorted(self.__members, key=self.__order.get)]
+
+    def on_vertex_added(self, vertex):
+        if self.__outdated:
+            return
+        c = self.__next_component
+        self.__next_component += 1
+        self.__component[vertex], self.__members[c] = c, [vertex]
+        # Positions are only ever reused between existing components, so a new one goes after all of them
+        self.__order[c] = self.__next_position
+        self.__next_position += 1
+        self.__out[c], self.__in[c] = set(), set()
+
+    def on_vertex_removed(self, vertex):
+        self.__outdated = True
+
+    def on_edge_removed(self, _from, _to):
+        self.__outdated = True
+
+    def on_edge_added(self, _from, _to, cost):
+        if self.__outdated:
+            return
+        self.__updates += 1
+        if self.__updates > self.__max_updates:
+            self.__outdated = True
+            return
+        c_from, c_to = self.__component[_from], self.__component[_to]
+        if c_from == c_to:
+            return
+        order = self.__order
+        if order[c_from] < order[c_to]:
+            self.__out[c_from].add(c_to)
+            self.__in[c_to].add(c_from)
+            return
+        # The new edge goes backwards in the topological order. Find the components between the 2 ends (in the
+        # topological order) which can be reached from <c_to> and the ones which can reach <c_from>.
+        lower, upper = order[c_to], order[c_from]
+        forward = self.__search(c_to, self.__out, lambda c: order[c] <= upper)
+        backward = self.__search(c_from, self.__in, lambda c: order[c] >= lower)
+        # The components found by both searches are on a cycle closed by the new edge
+        cycle = forward & backward
+        positions = sorted(order[c] for c in forward | backward)
+        before = sorted(backward - cycle, key=order.get)
+        after = sorted(forward - cycle, key=order.get)
+        # The components which reach <c_from> move down, the ones reached from <c_to> move up
+        for c, position in zip(before, positions):
+            order[c] = position
+        for c, position in zip(after, positions[len(positions) - len(after):]):
+            order[c] = position
+        if cycle:
+            order[self.__merge(cycle)] = positions[len(before)]
+        else:
+            self.__out[c_from].add(c_to)
+            self.__in[c_to].add(c_from)
+
+    @staticmethod
+    def __search(start, edges, allowed):
+        """
+        Finds the components which can be reached from the component <start> by going only through components
+        satisfying the condition <allowed>.
+        :param start: The starting component; integer
+        :param edges: The edges of the condensation to follow; dictionary (component -> set of components)
+        :param allowed: A function which says if a component can be visited or not
+        :return: The set of reached components (including <start>)
+        """
+        found = {start}
+        stack = [start]
+        while stack:
+            for neighbour in edges[stack.pop()]:
+                if neighbour not in found and allowed(neighbour):
+                    found.add(neighbour)
+                    stack.append(neighbour)
+        return found
+
+    def __merge(self, components):
+        """
+        Merges the given components into a single one (the largest of them keeps its number).
+        :param components: The components to merge; set of integers
+        :return: The number of the merged component
+        """
+        kept = max(components, key=lambda c: len(self.__members[c]))
+        for c in components:
+            if c == kept:
+                continue
+            for vertex in self.__members[c]:
+                self.__component[vertex] = kept
+            self.__members[kept].extend(self.__members.pop(c))
+            for neighbour in self.__out.pop(c):
+                self.__in[neighbour].discard(c)
+                self.__in[neighbour].add(kept)
+                self.__out[kept].add(neighbour)
+            for neighbour in self.__in.pop(c):
+                self.__out[neighbour].discard(c)
+                self.__out[neighbour].add(kept)
+                self.__in[kept].add(neighbour)
+            del self.__order[c]
+        self.__out[kept] -= components
+        self.__in[kept] -= components
+        return kept
+
+
+class ReachabilityIndex(GraphListener):
+    def __init__(self, graph, closure_limit=CLOSURE_LIMIT):
+        """
+        Answers "is there a path from u to v" questions without searching the graph. The index is built on the
+        condensation of the graph (two vertices of the same strongly connected component reach each other):
+        - if the condensation has at most <closure_limit> components, the full transitive closure is kept, as a
+        bitset (a Python integer) of reachable components for every component, so every query is a bit test;
+        - otherwise every component gets INTERVAL_LABELINGS interval labels from randomized Depth First Searches
+        (GRAIL): if u reaches v then every label of v is inside the corresponding label of u, so most negative
+        queries are answered right away and the others by a search which skips the components whose labels
+        exclude v.
+        Any change of the vertices or edges of the graph marks the index as outdated; it is rebuilt by the next
+        query.
+        :param graph: The graph; an instance of TripleDictGraph (the index attaches itself to it)
+        :param closure_limit: The largest number of components for which the transitive closure is kept
+        """
+        self.__graph = graph
+        self.__closure_limit = closure_limit
+        self.__outdated = True
+        self.__component = {}
+        self.__out = []
+        self.__closure = None
+        self.__labels = []
+        graph.add_listener(self)
+
+    def __rebuild(self):
+        """
+        Recomputes the whole index from the condensation of the graph.
+        """
+        dag = self.__graph.condensation()
+        no_components = dag.get_no_vertices()
+        self.__component = dict(zip(dag.vertices, dag.component.tolist()))
+        self.__out = [list(dag.get_outbound_neighbours(c)) for c in range(no_components)]
+        self.__closure, self.__labels = None, []
+        if no_components <= self.__closure_limit:
+            # The components are numbered in topological order, so going backwards every component is processed
+            # after all the components it reaches
+            closure = [0] * no_components
+            for c in range(no_components - 1, -1, -1):
+                reach = 1 << c
+                for neighbour in self.__out[c]:
+                    reach |= closure[neighbour]
+                closure[c] = reach
+            self.__closure = closure
+        else:
+            for _ in range(INTERVAL_LABELINGS):
+                self.__labels.append(self.__interval_labeling(no_components))
+        self.__outdated = False
+
+    def __interval_labeling(self, no_components):
+        """
+        Labels every component c with an interval [low[c], post[c]], where post is the postorder number of c in a
+        Depth First Search visiting the children in random order and low is the smallest postorder number
+        reachable from c.
+        :return: A pair of lists (low, post)
+        """
+        low, post = [0] * no_components, [-1] * no_components
+        counter = 0
+        for root in random.sample(range(no_components), no_components):
+            if post[root] != -1:
+                continue
+            post[root] = -2
+            call_stack = [(root, random.sample(self.__out[root], len(self.__out[root])))]
+            while call_stack:
+                c, children = call_stack[-1]
+                if children:
+                    child = children.pop()
+                    if post[child] == -1:
+                        post[child] = -2
+                        call_stack.append((child, random.sample(self.__out[child], len(self.__out[child]))))
+                    continue
+                call_stack.pop()
+                post[c], counter = counter, counter + 1
+                low[c] = min([post[c]] + [low[child] for child in self.__out[c]])
+        return low, post
+
+    def __may_reach(self, c1, c2):
+        """
+        Returns False if the labels prove that the component <c1> does not reach the component <c2>.
+        """
+        for low, post in self.__labels:
+            if not low[c1] <= low[c2] or not post[c2] <= post[c1]:
+                return False
+        return True
+
+    def is_up_to_date(self):
+        """
+        Checks if the index was built after the last change of the graph (so a query will not rebuild it).
+        """
+        return not self.__outdated
+
+    def is_reachable(self, start_vertex, end_vertex):
+        """
+        Checks if there is a path from <start_vertex> to <end_vertex>.
+        :param start_vertex: Integer; The vertex where the path starts
+        :param end_vertex: Integer; The vertex where the path ends
+        :return: True if <end_vertex> is accessible from <start_vertex>; False otherwise
+        :except: GraphException - if one of the given vertices is not in the graph
+        """
+        if self.__outdated:
+            self.__rebuild()
+        if start_vertex not in self.__component:
+            raise GraphException(f"Error! The starting vertex {start_vertex} is not in the graph.")
+        if end_vertex not in self.__component:
+            raise GraphException(f"Error! The ending vertex {end_vertex} is not in the graph.")
+        c1, c2 = self.__component[start_vertex], self.__component[end_vertex]
+        if self.__closure is not None:
+            return bool(self.__closure[c1] >> c2 & 1)
+        # The components are numbered in topological order, so a component never reaches a smaller one
+        if c1 == c2:
+            return True
+        if c1 > c2 or not self.__may_reach(c1, c2):
+            return False
+        found, stack = {c1}, [c1]
+        while stack:
+            for neighbour in self.__out[stack.pop()]:
+                if neighbour == c2:
+                    return True
+                if neighbour not in found and neighbour < c2 and self.__may_reach(neighbour, c2):
+                    found.add(neighbour)
+                    stack.append(neighbour)
+        return False
+
+    def on_vertex_added(self, vertex):
+        self.__outdated = True
+
+    def on_vertex_removed(self, vertex):
+        self.__outdated = True
+
+    def on_edge_added(self, _from, _to, cost):
+        self.__outdated = True
+
+    def on_edge_removed(self, _from, _to):
+        self.__outdated = True
+
+
+class DisjointSet:
+    def __init__(self, no_elements):
+        """
+        Disjoint-set forest (union-find) over the elements 0, 1, ..., <no_elements> - 1, kept in 2 arrays: the
+        parent of every element and the rank (an upper bound of the height) of every tree. Uses union by rank and
+        path compression, so any sequence of operations takes almost linear time.
+        :param no_elements: The number of elements; integer
+        """
+        self.__parent = list(range(no_elements))
+        self.__rank = [0] * no_elements
+
+    def find(self, element):
+        """
+        Returns the representative of the set containing the given element. All the elements on the way to the
+        representative are linked directly to it.
+        :param element: An element; integer
+        :return: The representative of the set of <element>; integer
+        """
+        parent = self.__parent
+        root = element
+        while parent[root] != root:
+            root = parent[root]
+        while parent[element] != root:
+            parent[element], element = root, parent[element]
+        return root
+
+    def union(self, first, second):
+        """
+        Joins the sets containing the 2 given elements.
+        :return: True if the 2 elements were in different sets; False otherwise
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self.__rank[first] < self.__rank[second]:
+            first, second = second, first
+        self.__parent[second] = first
+        if self.__rank[first] == self.__rank[second]:
+            self.__rank[first] += 1
+        return True
+
+    def get_sets(self):
+        """
+        Returns all the sets as a list of lists of elements; the sets are given in the order of their smallest
+        elements.
+        """
+        sets = {}
+        for element in range(len(self.__parent)):
+            sets.setdefault(self.find(element), []).append(element)
+        return list(sets.values())
 
 
 class TripleDictGraph:
@@ -18,6 +577,11 @@ class TripleDictGraph:
         for i in range(no_vertices):
             self.__dict_in[i] = []
             self.__dict_out[i] = []
+        # Every change of the graph increments the version and is reported to the listeners (see GraphListener)
+        self.__version = 0
+        self.__listeners = []
+        self.__scc_index = None
+        self.__reachability_index = None
 
     def get_no_vertices(self):
         """
@@ -25,6 +589,30 @@ class TripleDictGraph:
         """
         return len(self.__dict_in.keys())
 
+    def get_version(self):
+        """
+        Returns the version of the graph: a number which changes every time the graph is modified. It can be used
+        to check if something computed from the graph is still up to date.
+        """
+        return self.__version
+
+    def add_listener(self, listener):
+        """
+        Attaches a listener to the graph; from now on it will be told about all the changes of the graph.
+        :param listener: An instance of GraphListener
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Detaches a listener from the graph.
+        :param listener: An instance of GraphListener which was attached to the graph
+        :except: GraphException - if the listener is not attached to the graph
+        """
+        if listener not in self.__listeners:
+            raise GraphException("The listener is not attached to the graph.")
+        self.__listeners.remove(listener)
+
     def get_no_edges(self):
         """
         Returns the number of edges in the graph.
@@ -169,7 +757,11 @@ class TripleDictGraph:
         """
         if not self.is_edge_in_graph(_from, _to):
             raise GraphException("The edge does not exist in the graph.")
+        old_cost = self.__cost[(_from, _to)]
         self.__cost[(_from, _to)] = new_cost
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_edge_cost_changed(_from, _to, old_cost, new_cost)
 
     def add_edge(self, _from, _to, cost):
         """
@@ -190,6 +782,9 @@ class TripleDictGraph:
         self.__dict_in[_to].append(_from)
         self.__dict_out[_from].append(_to)
         self.__cost[(_from, _to)] = cost
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_edge_added(_from, _to, cost)
 
     def remove_edge(self, _from, _to):
         """
@@ -209,6 +804,9 @@ class TripleDictGraph:
         self.__dict_in[_to].remove(_from)
         self.__dict_out[_from].remove(_to)
         del self.__cost[(_from, _to)]
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_edge_removed(_from, _to)
 
     def add_vertex(self, vertex):
         """
@@ -221,6 +819,9 @@ class TripleDictGraph:
             raise GraphException("The vertex already exists.")
         self.__dict_in[vertex] = []
         self.__dict_out[vertex] = []
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_vertex_added(vertex)
 
     def remove_vertex(self, vertex):
         """
@@ -243,14 +844,19 @@ class TripleDictGraph:
                 self.__dict_out[v] = [node for node in self.__dict_out[v] if node != vertex]
         # Now delete every edge which has the vertex <vertex> in it from <dict_cost>
         self.__cost = {key: value for (key, value) in self.__cost.items() if key[0] != vertex and key[1] != vertex}
-        # All that is left is to decrease the count of vertices
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_vertex_removed(vertex)
 
-    def bfs(self, start_vertex, end_vertex):
+    def bfs(self, start_vertex, end_vertex, engine="python"):
         """
         Performs a modified Breadth First Search from the given starting vertex. Once the search reaches the
         vertex <end_vertex> (that is, if it reaches it), the algorithm stops.
         :param start_vertex: Integer; the vertex where the Breadth First Search starts from
         :param end_vertex: Integer; if the algorithm reaches this vertex, then the function stops
+        :param engine: "python" - a queue based search, vertex by vertex; "vectorized" - a level-synchronous,
+        direction-optimizing search over numpy arrays (see __bfs_vectorized), meant for very large graphs. Both
+        engines give exactly the same results.
         :returns: dictionary visited - the keys are all the vertices from the graph, the values are truth
         values denoting whether or not that vertex is accessible from the starting vertex
         :returns: dictionary prev - the keys are all the vertices from the graph, the value of each key is the
@@ -259,9 +865,14 @@ class TripleDictGraph:
         of the paths from the starting vertex to that vertex or INFINITY if that vertex is not accessible
         from the starting vertex
         :except: GraphException - if the given <start_vertex> is not in the graph
+        :except: GraphException - if the given engine is unknown
         """
         if not self.is_vertex_in_graph(start_vertex):
             raise GraphException(f"Error! The vertex {start_vertex} is not in the graph.")
+        if engine == "vectorized":
+            return self.__bfs_vectorized(start_vertex, end_vertex)
+        if engine != "python":
+            raise GraphException(f"Error! Unknown BFS engine {engine}; expected 'python' or 'vectorized'.")
         # Initialize the visited dictionary with False values, the distance dictionary with infinity values
         # and the previous dictionary with None values
         visited = {node: False for node in self.get_all_vertices()}
@@ -285,6 +896,131 @@ class TripleDictGraph:
                         return visited, prev, dist
         return visited, prev, dist
 
+    def __bfs_vectorized(self, start_vertex, end_vertex):
+        """
+        Level-synchronous Breadth First Search which keeps the frontier as a numpy array (in queue order) and
+        expands a whole level at once. Small frontiers are expanded top-down by gathering the outbound edges of the
+        frontier from the CSR view; large frontiers are expanded bottom-up by letting every unvisited vertex look
+        for a parent among its inbound neighbours (Beamer's direction-optimizing BFS). In both directions a vertex
+        is given the parent which comes first in the queue order, and the new frontier is ordered the way the
+        queue would have ordered it, so the results are identical to those of the queue based BFS.
+        :param start_vertex: Integer; the vertex where the Breadth First Search starts from
+        :param end_vertex: Integer; if the algorithm reaches this vertex, then the function stops
+        :returns: The dictionaries visited, prev and dist; see bfs
+        """
+        csr = self.get_csr_view("out")
+        n = csr.get_no_vertices()
+        out_degrees = csr.get_degrees()
+        # The inbound edges are obtained by sorting the outbound ones by their ending vertex; <in_edges> keeps the
+        # position of every inbound edge in the outbound CSR view
+        in_edges = numpy.argsort(csr.targets, kind="stable")
+        in_from = csr.get_sources()[in_edges]
+        in_to = csr.targets[in_edges]
+        in_degrees = numpy.bincount(csr.targets, minlength=n)
+
+        visited = numpy.zeros(n, dtype=bool)
+        dist = numpy.full(n, INFINITY, dtype=numpy.int64)
+        prev = numpy.full(n, -1, dtype=numpy.int64)
+        position = numpy.full(n, -1, dtype=numpy.int64)
+        start = csr.index[start_vertex]
+        end = csr.index.get(end_vertex, -1)
+        frontier = numpy.array([start], dtype=numpy.int64)
+        visited[start], dist[start] = True, 0
+        level, bottom_up = 0, False
+        while len(frontier):
+            level += 1
+            frontier_edges = int(out_degrees[frontier].sum())
+            if not bottom_up and frontier_edges * BOTTOM_UP_ALPHA > int(in_degrees[~visited].sum()):
+                bottom_up = True
+            elif bottom_up and len(frontier) * BOTTOM_UP_BETA < n:
+                bottom_up = False
+            if bottom_up:
+                position[frontier] = numpy.arange(len(frontier))
+                candidates = numpy.flatnonzero(~visited[in_to] & (position[in_from] >= 0))
+                children, parents = in_to[candidates], in_from[candidates]
+                edges = in_edges[candidates]
+                # The parent of a vertex is its inbound neighbour which comes first in the frontier
+                order = numpy.lexsort((position[parents], children))
+                _, first = numpy.unique(children[order], return_index=True)
+                chosen = order[first]
+                chosen = chosen[numpy.lexsort((edges[chosen], position[parents[chosen]]))]
+                position[frontier] = -1
+                children, parents = children[chosen], parents[chosen]
+            else:
+                starts = csr.offsets[frontier]
+                degrees = out_degrees[frontier]
+                edges = numpy.arange(frontier_edges) + numpy.repeat(starts - (numpy.cumsum(degrees) - degrees),
+                                                                      degrees)
+                children, parents = csr.targets[edges], numpy.repeat(frontier, degrees)
+                unvisited = ~visited[children]
+                children, parents = children[unvisited], parents[unvisited]
+                # Keep the first discovery of every vertex, in discovery order
+                _, first = numpy.unique(children, return_index=True)
+                first.sort()
+                children, parents = children[first], parents[first]
+            reached_end = numpy.flatnonzero(children == end)
+            if len(reached_end):
+                children, parents = children[:reached_end[0] + 1], parents[:reached_end[0] + 1]
+            visited[children] = True
+            dist[children] = level
+            prev[children] = parents
+            if len(reached_end):
+                break
+            frontier = children
+
+        vertices = csr.vertices
+        prev = [vertices[parent] if parent >= 0 else None for parent in prev.tolist()]
+        return dict(zip(vertices, visited.tolist())), dict(zip(vertices, prev)), dict(zip(vertices, dist.tolist()))
+
+    def bfs_layers(self, start_vertex):
+        """
+        Performs a Breadth First Search from the given starting vertex, one level at a time: using a generator,
+        returns the vertices at distance 0 (just <start_vertex>), then the ones at distance 1 and so on, each level
+        as a tuple (in the order the queue based bfs would visit them). The search only advances when the next
+        level is asked for, so the caller can stop at any depth without paying for the rest of the traversal.
+        :param start_vertex: Integer; the vertex where the Breadth First Search starts from
+        :return: A generator with the levels of the search; tuples of vertices
+        :except: GraphException - if the given <start_vertex> is not in the graph
+        """
+        if not self.is_vertex_in_graph(start_vertex):
+            raise GraphException(f"Error! The vertex {start_vertex} is not in the graph.")
+        visited = {start_vertex}
+        level = (start_vertex,)
+        while level:
+            yield level
+            next_level = []
+            for vertex in level:
+                for neighbour in self.__dict_out[vertex]:
+                    if neighbour not in visited:
+                        visited.add(neighbour)
+                        next_level.append(neighbour)
+            level = tuple(next_level)
+
+    def k_hop_neighbourhood(self, vertex, k):
+        """
+        Builds the subgraph induced by the vertices which can be reached from <vertex> by a path of length at most
+        <k>, i.e. these vertices together with all the edges between them (with their costs).
+        :param vertex: Integer; the vertex in the center of the neighbourhood
+        :param k: Integer; the largest allowed length of the paths
+        :return: A new graph (instance of the TripleDictGraph class)
+        :except: GraphException - if the given vertex is not in the graph or <k> is negative
+        """
+        if not self.is_vertex_in_graph(vertex):
+            raise GraphException(f"Error! The vertex {vertex} is not in the graph.")
+        if k < 0:
+            raise GraphException("Error! The number of hops must be non-negative.")
+        neighbourhood = TripleDictGraph()
+        for depth, level in enumerate(self.bfs_layers(vertex)):
+            for node in level:
+                neighbourhood.add_vertex(node)
+            if depth == k:
+                break
+        for node in neighbourhood.get_all_vertices():
+            for neighbour in self.__dict_out[node]:
+                if neighbourhood.is_vertex_in_graph(neighbour):
+                    neighbourhood.add_edge(node, neighbour, self.__cost[(node, neighbour)])
+        return neighbourhood
+
     def lowest_length_path(self, start_vertex, end_vertex):
         """
         Finds the lowest length path between <start_vertex> and <end_vertex> using a forward breadth first
@@ -301,6 +1037,10 @@ class TripleDictGraph:
             raise GraphException(f"Error! The starting vertex {start_vertex} is not in the graph.")
         if not self.is_vertex_in_graph(end_vertex):
             raise GraphException(f"Error! The ending vertex {end_vertex} is not in the graph.")
+        # The index only answers the question if it is current; rebuilding it would cost more than the BFS
+        index = self.__reachability_index
+        if index is not None and index.is_up_to_date() and not index.is_reachable(start_vertex, end_vertex):
+            raise GraphException(f"Error! The node {end_vertex} is not accessible from node {start_vertex}.")
         visited, prev, dist = self.bfs(start_vertex, end_vertex)
         if not visited[end_vertex]:
             raise GraphException(f"Error! The node {end_vertex} is not accessible from node {start_vertex}.")
@@ -312,6 +1052,127 @@ class TripleDictGraph:
         path.append(node)
         return path[::-1]
 
+    def get_csr_view(self, direction="out"):
+        """
+        Builds a compressed sparse row view of the graph (see CSRView). This is done in O(V + E) and it is meant to
+        be built once and shared by the algorithms which need to traverse the whole graph many times.
+        :param direction: "out" - the neighbours of a vertex are its outbound neighbours; "in" - the neighbours of
+        a vertex are its inbound neighbours
+        :return: An instance of CSRView
+        :except: GraphException - if the given direction is not "in" or "out"
+        """
+        if direction == "out":
+            adjacency = self.__dict_out
+        elif direction == "in":
+            adjacency = self.__dict_in
+        else:
+            raise GraphException(f"Error! Unknown direction {direction}; expected 'in' or 'out'.")
+        vertices = list(self.get_all_vertices())
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        offsets = numpy.zeros(len(vertices) + 1, dtype=numpy.int64)
+        targets, costs = [], []
+        for i, vertex in enumerate(vertices):
+            neighbours = adjacency[vertex]
+            offsets[i + 1] = offsets[i] + len(neighbours)
+            targets.extend(index[neighbour] for neighbour in neighbours)
+            if direction == "out":
+                costs.extend(self.__cost[(vertex, neighbour)] for neighbour in neighbours)
+            else:
+                costs.extend(self.__cost[(neighbour, vertex)] for neighbour in neighbours)
+        return CSRView(vertices, offsets, numpy.array(targets, dtype=numpy.int64), numpy.array(costs))
+
+    def bfs_many(self, sources, targets=None, paths=False):
+        """
+        Computes the lowest length paths from many starting vertices at once using a bit-parallel Breadth First
+        Search: up to WORD_SIZE sources are searched simultaneously, each one owning a bit of a machine word, and
+        every level of all these searches is expanded with a single pass over the (inbound) CSR view of the graph.
+        :param sources: The starting vertices; iterable of integers
+        :param targets: The ending vertices; iterable of integers or None for all the vertices of the graph (in the
+        order given by get_all_vertices)
+        :param paths: If True, the lowest length paths are returned instead of their lengths
+        :return: If <paths> is False, a numpy matrix of integers with a row for every source and a column for every
+        target holding the length of the lowest length path from the source to the target or INFINITY if the
+        target is not accessible from the source. If <paths> is True, a list of lists with the same shape, holding
+        the lowest length paths (lists of vertices, in the same format as lowest_length_path) or None for the
+        inaccessible targets.
+        :except: GraphException - if one of the given sources or targets is not in the graph
+        """
+        sources = list(sources)
+        for vertex in sources:
+            if not self.is_vertex_in_graph(vertex):
+                raise GraphException(f"Error! The starting vertex {vertex} is not in the graph.")
+        if targets is None:
+            targets = list(self.get_all_vertices())
+        else:
+            targets = list(targets)
+            for vertex in targets:
+                if not self.is_vertex_in_graph(vertex):
+                    raise GraphException(f"Error! The ending vertex {vertex} is not in the graph.")
+        csr = self.get_csr_view("in")
+        n = csr.get_no_vertices()
+        target_indices = numpy.array([csr.index[vertex] for vertex in targets], dtype=numpy.int64)
+        # Every vertex pulls the frontier words of its inbound neighbours; vertices without inbound neighbours
+        # are masked out afterwards since reduceat does not handle empty segments. A zero word is appended to the
+        # gathered words, so the segments of the last vertices (without inbound neighbours) start inside the array
+        # without cutting the segment before them
+        has_in_edges = csr.get_degrees() > 0
+        segment_starts = csr.offsets[:-1]
+        sentinel = numpy.zeros(1, dtype=numpy.uint64)
+        result = numpy.full((len(sources), len(targets)), INFINITY, dtype=numpy.int64)
+        all_paths = []
+        for chunk_start in range(0, len(sources), WORD_SIZE):
+            chunk = [csr.index[vertex] for vertex in sources[chunk_start:chunk_start + WORD_SIZE]]
+            dist = numpy.full((len(chunk), n), INFINITY, dtype=numpy.int64)
+            frontier = numpy.zeros(n, dtype=numpy.uint64)
+            for bit, source in enumerate(chunk):
+                frontier[source] |= numpy.uint64(1 << bit)
+                dist[bit, source] = 0
+            seen = frontier.copy()
+            level = 0
+            while len(csr.targets) and frontier.any():
+                level += 1
+                reached = numpy.bitwise_or.reduceat(numpy.concatenate((frontier[csr.targets], sentinel)),
+                                                    segment_starts)
+                reached[~has_in_edges] = 0
+                frontier = reached & ~seen
+                seen |= frontier
+                vertices = numpy.flatnonzero(frontier)
+                if len(vertices) == 0:
+                    break
+                # Expand the words into a (vertex, source bit) boolean matrix to find which searches reached them
+                bits = numpy.unpackbits(frontier[vertices].astype("<u8").view(numpy.uint8).reshape(-1, 8),
+                                        axis=1, bitorder="little")[:, :len(chunk)]
+                rows, columns = numpy.nonzero(bits)
+                dist[columns, vertices[rows]] = level
+            result[chunk_start:chunk_start + len(chunk)] = dist[:, target_indices]
+            if paths:
+                for bit, source in enumerate(chunk):
+                    all_paths.append([self.__bfs_many_path(csr, dist[bit], source, target)
+                                      for target in target_indices])
+        return all_paths if paths else result
+
+    def __bfs_many_path(self, csr, dist, source, target):
+        """
+        Rebuilds a lowest length path from the distances computed by bfs_many by walking back from the target
+        over inbound neighbours which are one level closer to the source.
+        :param csr: The inbound CSR view used by bfs_many; instance of CSRView
+        :param dist: The lengths of the lowest length paths from <source> to every vertex index; numpy array
+        :param source: The index of the starting vertex; integer
+        :param target: The index of the ending vertex; integer
+        :return: The path as a list of vertices or None if <target> is not accessible from <source>
+        """
+        if dist[target] == INFINITY:
+            return None
+        path = [csr.vertices[target]]
+        node = target
+        while node != source:
+            for neighbour in csr.targets[csr.offsets[node]:csr.offsets[node + 1]]:
+                if dist[neighbour] == dist[node] - 1:
+                    node = neighbour
+                    break
+            path.append(csr.vertices[node])
+        return path[::-1]
+
     def kosaraju(self):
         """
         Finds all of the strongly connected components of the graph using the Kosaraju algorithm.
@@ -357,44 +1218,62 @@ class TripleDictGraph:
         comps = [value for value in d.values()]
         return comps
 
-    def __dfs1(self, vertex, visited, stack):
-        """
-        Traverses all the vertices from the graph using the Depth First Search algorithm and pushes all the
-        vertices on a stack such that the last vertex visited will be the first one pushed on the stack (so the
-        first vertex visited will be at the top of the stack after the algorithm finishes). This function is meant
-        to be used as the first DFS in The Kosaraju Algorithm.
-        :param vertex: The current vertex that is being traversed; Integer
-        :param visited: Keeps track of whether or not a vertex was already visited; List of bool values
-        :param stack: The stack where we will push the visited vertices; List
-        :except GraphException: If the given vertex <vertex> is not in the graph (This can only happen in the
-        first call of the function, when the function is called by the user)
-        """
-        if not self.is_vertex_in_graph(vertex):
-            raise GraphException(f"ERROR: The vertex {vertex} is not in the graph.")
-        visited[vertex] = True
-        for neighbour in self.__dict_out[vertex]:
-            if not visited[neighbour]:
-                self.__dfs1(neighbour, visited, stack)
-        stack.append(vertex)
-
-    def __dfs2(self, vertex, visited, strongly_connected_comps):
+    def __scc_ids(self):
         """
-        Traverses all the vertices from the graph using the Depth First Search algorithm and appends the currently
-        visited vertex in the last list from the <strongly_connected_comps> list. This function is meant to be
-        used as the second DFS in The Kosaraju Algorithm.
-        :param vertex: The current vertex that is being traversed; Integer
-        :param visited: Keeps track of whether or not a vertex was already visited; List of bool values
-        :param strongly_connected_comps: List of lists where the strongly connected components will be stored
-        :except GraphException: If the given vertex <vertex> is not in the graph (This can only happen in the
-        first call of the function, when the function is called by the user)
+        Finds the strongly connected components of the graph in a single Depth First Search using Pearce's
+        iterative variant of Tarjan's algorithm. No recursion is used (so there is no limit on the length of the
+        paths in the graph) and, apart from the search stacks, the only extra memory is a few arrays of V integers.
+        :return: A tuple (vertices, component, no_components) where <vertices> lists the vertices of the graph
+        (index -> vertex), component[i] is the strongly connected component of vertices[i] and <no_components>
+        is the number of components. The components are numbered 0, 1, ... in topological order, i.e. every edge
+        between 2 different components goes from a smaller number to a bigger one.
         """
-        if not self.is_vertex_in_graph(vertex):
-            raise GraphException(f"ERROR: The vertex {vertex} is not in the graph.")
-        visited[vertex] = True
-        strongly_connected_comps[-1].append(vertex)
-        for neighbour in self.__dict_out[vertex]:
-            if not visited[neighbour]:
-                self.__dfs2(neighbour, visited, strongly_connected_comps)
+        vertices = list(self.get_all_vertices())
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        n = len(vertices)
+        # rindex[v] is 0 for unvisited vertices, the (low) visiting index of the vertices which are still on the
+        # stack and n - 1, n - 2, ... (always bigger than any visiting index) for the vertices already assigned
+        # to a component
+        rindex = [0] * n
+        is_root = [False] * n
+        next_edge = [0] * n
+        stack = []
+        visit_index, component_index = 1, n - 1
+        for root in range(n):
+            if rindex[root]:
+                continue
+            rindex[root], is_root[root], visit_index = visit_index, True, visit_index + 1
+            call_stack = [root]
+            while call_stack:
+                v = call_stack[-1]
+                neighbours = self.__dict_out[vertices[v]]
+                i = next_edge[v]
+                while i < len(neighbours):
+                    w = index[neighbours[i]]
+                    if not rindex[w]:
+                        break
+                    # We get here either for an already visited neighbour or after returning from the neighbour
+                    if rindex[w] < rindex[v]:
+                        rindex[v], is_root[v] = rindex[w], False
+                    i += 1
+                next_edge[v] = i
+                if i < len(neighbours):
+                    rindex[w], is_root[w], visit_index = visit_index, True, visit_index + 1
+                    call_stack.append(w)
+                    continue
+                call_stack.pop()
+                if not is_root[v]:
+                    stack.append(v)
+                    continue
+                visit_index -= 1
+                while stack and rindex[v] <= rindex[stack[-1]]:
+                    rindex[stack.pop()] = component_index
+                    visit_index -= 1
+                rindex[v] = component_index
+                component_index -= 1
+        # The first finished component got the number n - 1; renumber the components from 0
+        component = [c - component_index - 1 for c in rindex]
+        return vertices, component, n - 1 - component_index
 
     def transposed_graph(self):
         """
@@ -409,26 +1288,139 @@ class TripleDictGraph:
             new_graph.add_edge(_to, _from, _cost)
         return new_graph
 
-    def find_all_scc(self):
+    def find_all_scc(self, parallel=None):
         """
-        Finds all of the strongly connected components of the graph using the Kosaraju algorithm.
-        :return: List of lists where each lists contains all the vertices from a strongly connected component
+        Finds all of the strongly connected components of the graph using Pearce's iterative, single pass variant
+        of Tarjan's algorithm (see __scc_ids). Unlike kosaraju, the vertices can be any integers.
+        :param parallel: None - the components are found by the current process; a number N - the components are
+        found by N worker processes using the Forward-Backward algorithm (see __parallel_scc)
+        :return: List of lists where each lists contains all the vertices from a strongly connected component; the
+        components are given in topological order (only when <parallel> is None)
+        :except: GraphException - if <parallel> is not a positive number
         """
-        stack = []
-        visited = [False] * self.get_no_vertices()
-        for vertex in self.get_all_vertices():
-            if not visited[vertex]:
-                self.__dfs1(vertex, visited, stack)
-        transposed_graph = self.transposed_graph()
-        visited = [False] * self.get_no_vertices()
-        strongly_connected_comps = []
-        while stack:
-            top = stack.pop()
-            if not visited[top]:
-                strongly_connected_comps.append([])
-                transposed_graph.__dfs2(top, visited, strongly_connected_comps)
+        if parallel is not None:
+            if parallel < 1:
+                raise GraphException("ERROR: The number of worker processes must be positive.")
+            return self.__parallel_scc(parallel)
+        vertices, component, no_components = self.__scc_ids()
+        strongly_connected_comps = [[] for _ in range(no_components)]
+        for vertex, c in zip(vertices, component):
+            strongly_connected_comps[c].append(vertex)
         return strongly_connected_comps
 
+    def __parallel_scc(self, no_workers):
+        """
+        Finds the strongly connected components of the graph with the Forward-Backward algorithm, spread over a
+        pool of worker processes. The inbound and outbound CSR views of the graph are put in shared memory, so the
+        workers only receive the (numpy arrays of) vertices of the parts of the graph they have to split. Every
+        step first trims the vertices without inbound or outbound neighbours (each one is a component on its own),
+        then takes a pivot and finds its component as the intersection of the vertices reachable from it and the
+        vertices which reach it. What is left falls apart in 3 parts with no component crossing between them, which
+        become new tasks; small parts are solved directly by the worker (see _fb_scc_task).
+        :param no_workers: The number of worker processes; integer
+        :return: List of lists where each lists contains all the vertices from a strongly connected component
+        """
+        out_view, in_view = self.get_csr_view("out"), self.get_csr_view("in")
+        arrays = [out_view.offsets, out_view.targets, in_view.offsets, in_view.targets]
+        blocks = []
+        components = []
+        try:
+            for array in arrays:
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                numpy.ndarray(array.shape, dtype=numpy.int64, buffer=block.buf)[:] = array
+                blocks.append(block)
+            shapes = [len(array) for array in arrays]
+            with ProcessPoolExecutor(max_workers=no_workers, initializer=_attach_shared_csr,
+                                     initargs=([block.name for block in blocks], shapes)) as executor:
+                pending = set()
+                if out_view.get_no_vertices():
+                    pending.add(executor.submit(_fb_scc_task, numpy.arange(out_view.get_no_vertices())))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        found, tasks = future.result()
+                        components.extend(found)
+                        for task in tasks:
+                            pending.add(executor.submit(_fb_scc_task, task))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        return [[out_view.vertices[i] for i in component] for component in components]
+
+    def weakly_connected_components(self):
+        """
+        Finds the weakly connected components of the graph (the connected components of the graph obtained by
+        ignoring the orientation of the edges) with a disjoint-set forest; every edge is looked at once.
+        :return: List of lists where each list contains all the vertices from a weakly connected component
+        """
+        vertices = list(self.get_all_vertices())
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        disjoint_set = DisjointSet(len(vertices))
+        for _from, _to in self.__cost:
+            disjoint_set.union(index[_from], index[_to])
+        return [[vertices[i] for i in component] for component in disjoint_set.get_sets()]
+
+    def get_scc_index(self):
+        """
+        Returns the strongly connected components index of the graph (see SCCIndex). The index is created the
+        first time this function is called and is then kept up to date as the graph changes.
+        :return: An instance of SCCIndex
+        """
+        if self.__scc_index is None:
+            self.__scc_index = SCCIndex(self)
+        return self.__scc_index
+
+    def get_reachability_index(self):
+        """
+        Returns the reachability index of the graph (see ReachabilityIndex). The index is created the first time
+        this function is called and is then kept up to date as the graph changes. Once it exists, it is also used
+        by lowest_length_path to reject inaccessible vertices without searching the graph.
+        :return: An instance of ReachabilityIndex
+        """
+        if self.__reachability_index is None:
+            self.__reachability_index = ReachabilityIndex(self)
+        return self.__reachability_index
+
+    def is_reachable(self, start_vertex, end_vertex):
+        """
+        Checks if there is a path from <start_vertex> to <end_vertex> using the reachability index of the graph.
+        :param start_vertex: Integer; The vertex where the path starts
+        :param end_vertex: Integer; The vertex where the path ends
+        :return: True if <end_vertex> is accessible from <start_vertex>; False otherwise
+        :except: GraphException - if one of the given vertices is not in the graph
+        """
+        return self.get_reachability_index().is_reachable(start_vertex, end_vertex)
+
+    def condensation(self):
+        """
+        Builds the condensation of the graph (the Directed Acyclic Graph of its strongly connected components,
+        see CondensedGraph). The components are found with a single pass (see __scc_ids), after which the edges
+        between different components are deduplicated and their costs aggregated with numpy array operations
+        over the CSR view of the graph.
+        :return: An instance of CondensedGraph
+        """
+        vertices, component, no_components = self.__scc_ids()
+        component = numpy.array(component, dtype=numpy.int64)
+        csr = self.get_csr_view("out")
+        _from, _to = component[csr.get_sources()], component[csr.targets]
+        between = _from != _to
+        # Sorting the (from, to) pairs groups the parallel edges and also gives the CSR order of the condensation
+        keys = _from[between] * no_components + _to[between]
+        order = numpy.argsort(keys, kind="stable")
+        keys, costs = keys[order], csr.costs[between][order]
+        starts = numpy.flatnonzero(numpy.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else order
+        keys = keys[starts]
+        if len(keys):
+            min_cost = numpy.minimum.reduceat(costs, starts)
+            max_cost = numpy.maximum.reduceat(costs, starts)
+            sum_cost = numpy.add.reduceat(costs, starts)
+        else:
+            min_cost = max_cost = sum_cost = costs
+        offsets = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(keys // no_components,
+                                                                      minlength=no_components))))
+        return CondensedGraph(vertices, component, offsets, keys % no_components, min_cost, max_cost, sum_cost)
+
     def get_copy_of_graph(self):
         """
         Returns a copy of the graph.
@@ -456,6 +1448,30 @@ def read_graph(file_name):
     return new_graph
 
 
+def weakly_connected_components_from_file(file_name):
+    """
+    Finds the weakly connected components of a graph stored in a file (in the format used by read_graph) without
+    building the graph: the file is read line by line and every edge is only used to join the components of its
+    ends, so the memory used is proportional to the number of vertices, not to the number of edges.
+    :param file_name: The name of the file where the graph is stored (should be given with extension i.e., 'txt')
+    :return: List of lists where each list contains all the vertices from a weakly connected component
+    :except: GraphException - if an edge of the file uses a vertex which is not in the graph
+    """
+    with open(file_name, 'r') as f:
+        no_vertices = int(f.readline().strip().split()[0])
+        disjoint_set = DisjointSet(no_vertices)
+        for line in f:
+            line = line.strip().split()
+            if len(line) < 2:
+                # Empty lines and the lines holding the isolated vertices
+                continue
+            _from, _to = int(line[0]), int(line[1])
+            if not 0 <= _from < no_vertices or not 0 <= _to < no_vertices:
+                raise GraphException(f"Error! The edge {_from}->{_to} uses a vertex which is not in the graph.")
+            disjoint_set.union(_from, _to)
+    return disjoint_set.get_sets()
+
+
 def write_graph(graph, file_name):
     """
     Writes the given graph in a file.
@@ -498,3 +1514,147 @@ def create_random_graph(no_vertices, no_edges):
             random_graph.add_edge(_from, _to, cost)
             no_edges = no_edges - 1
     return random_graph
+
+
+# The outbound and inbound CSR views of the graph, as seen by a worker process of the parallel SCC search
+_shared_csr = {}
+
+
+def _attach_shared_csr(names, shapes):
+    """
+    Initializes a worker process of the parallel SCC search: maps the shared memory blocks holding the CSR views
+    of the graph as numpy arrays.
+    :param names: The names of the shared memory blocks (out offsets, out targets, in offsets, in targets)
+    :param shapes: The lengths of the 4 arrays
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    arrays = [numpy.ndarray((shape,), dtype=numpy.int64, buffer=block.buf) for block, shape in zip(blocks, shapes)]
+    _shared_csr["blocks"] = blocks
+    _shared_csr["out"] = arrays[0], arrays[1]
+    _shared_csr["in"] = arrays[2], arrays[3]
+
+
+def _gather_neighbours(offsets, targets, vertices):
+    """
+    Returns the neighbours of all the given vertices (with repetitions), together with the position in <vertices>
+    of the vertex each of them is a neighbour of.
+    :param offsets: CSR offsets; numpy array
+    :param targets: CSR targets; numpy array
+    :param vertices: numpy array of vertex indices
+    :return: A pair of numpy arrays (neighbours, owners)
+    """
+    degrees = offsets[vertices + 1] - offsets[vertices]
+    total = int(degrees.sum())
+    edges = numpy.arange(total) + numpy.repeat(offsets[vertices] - (numpy.cumsum(degrees) - degrees), degrees)
+    return targets[edges], numpy.repeat(numpy.arange(len(vertices)), degrees)
+
+
+def _reachable(offsets, targets, start, allowed):
+    """
+    Finds the vertices reachable from <start> going only through the vertices marked in <allowed>.
+    :return: numpy array of booleans (vertex index -> reached or not)
+    """
+    reached = numpy.zeros(len(allowed), dtype=bool)
+    reached[start] = True
+    frontier = numpy.array([start])
+    while len(frontier):
+        neighbours, _ = _gather_neighbours(offsets, targets, frontier)
+        neighbours = numpy.unique(neighbours[allowed[neighbours] & ~reached[neighbours]])
+        reached[neighbours] = True
+        frontier = neighbours
+    return reached
+
+
+def _small_scc(offsets, targets, vertices):
+    """
+    Finds the strongly connected components of the subgraph induced by the given vertices using Pearce's
+    iterative algorithm (the same as TripleDictGraph.__scc_ids); meant for small subgraphs.
+    :return: List of lists of vertex indices
+    """
+    vertices = vertices.tolist()
+    inside = set(vertices)
+    neighbours = {v: [w for w in targets[offsets[v]:offsets[v + 1]].tolist() if w in inside] for v in vertices}
+    n = len(vertices)
+    rindex = dict.fromkeys(vertices, 0)
+    is_root, next_edge = {}, dict.fromkeys(vertices, 0)
+    stack, components = [], []
+    visit_index, component_index = 1, n - 1
+    for root in vertices:
+        if rindex[root]:
+            continue
+        rindex[root], is_root[root], visit_index = visit_index, True, visit_index + 1
+        call_stack = [root]
+        while call_stack:
+            v = call_stack[-1]
+            i = next_edge[v]
+            while i < len(neighbours[v]):
+                w = neighbours[v][i]
+                if not rindex[w]:
+                    break
+                if rindex[w] < rindex[v]:
+                    rindex[v], is_root[v] = rindex[w], False
+                i += 1
+            next_edge[v] = i
+            if i < len(neighbours[v]):
+                rindex[w], is_root[w], visit_index = visit_index, True, visit_index + 1
+                call_stack.append(w)
+                continue
+            call_stack.pop()
+            if not is_root[v]:
+                stack.append(v)
+                continue
+            visit_index -= 1
+            component = [v]
+            while stack and rindex[v] <= rindex[stack[-1]]:
+                w = stack.pop()
+                rindex[w] = component_index
+                component.append(w)
+                visit_index -= 1
+            rindex[v] = component_index
+            component_index -= 1
+            components.append(component)
+    return components
+
+
+def _fb_scc_task(vertices):
+    """
+    One task of the parallel SCC search, run by a worker process: splits the subgraph induced by the given
+    vertices with a trimming and a Forward-Backward step. The parts which are small enough are solved right away.
+    :param vertices: The vertex indices of the subgraph; numpy array
+    :return: A pair (components, tasks): the components found (lists of vertex indices) and the parts of the
+    subgraph that are left to be split (numpy arrays of vertex indices)
+    """
+    out_offsets, out_targets = _shared_csr["out"]
+    in_offsets, in_targets = _shared_csr["in"]
+    if len(vertices) <= SMALL_SCC_TASK:
+        return _small_scc(out_offsets, out_targets, vertices), []
+    allowed = numpy.zeros(len(out_offsets) - 1, dtype=bool)
+    allowed[vertices] = True
+    components = []
+    # Trimming: a vertex with no inbound or no outbound neighbours inside the subgraph is a component by itself
+    for _ in range(TRIM_ROUNDS):
+        outbound, out_owners = _gather_neighbours(out_offsets, out_targets, vertices)
+        inbound, in_owners = _gather_neighbours(in_offsets, in_targets, vertices)
+        has_out = numpy.bincount(out_owners[allowed[outbound]], minlength=len(vertices)) > 0
+        has_in = numpy.bincount(in_owners[allowed[inbound]], minlength=len(vertices)) > 0
+        trimmed = vertices[~(has_out & has_in)]
+        if not len(trimmed):
+            break
+        components.extend([v] for v in trimmed.tolist())
+        allowed[trimmed] = False
+        vertices = vertices[has_out & has_in]
+    if not len(vertices):
+        return components, []
+    degrees = (out_offsets[vertices + 1] - out_offsets[vertices]) * (in_offsets[vertices + 1] - in_offsets[vertices])
+    pivot = vertices[numpy.argmax(degrees)]
+    forward = _reachable(out_offsets, out_targets, pivot, allowed)
+    backward = _reachable(in_offsets, in_targets, pivot, allowed)
+    components.append(numpy.flatnonzero(forward & backward).tolist())
+    tasks = []
+    for part in (vertices[forward[vertices] & ~backward[vertices]], vertices[backward[vertices] & ~forward[vertices]],
+                 vertices[~forward[vertices] & ~backward[vertices]]):
+        if len(part) <= SMALL_SCC_TASK:
+            components.extend(_small_scc(out_offsets, out_targets, part))
+        else:
+            tasks.append(part)
+    return components, tasks
@@ -1,7 +1,9 @@
+import random
 import unittest
 from collections import Counter
 
-from directed_graph import read_graph, create_random_graph, write_graph, TripleDictGraph
+from directed_graph import read_graph, create_random_graph, write_graph, TripleDictGraph, SCCIndex, \
+    ReachabilityIndex, CLOSURE_LIMIT, INFINITY, weakly_connected_components_from_file
 from errors import GraphException
 
 
@@ -258,6 +260,44 @@ class TestTripleDictGraph(unittest.TestCase):
         self.assertGreater(list(dist.values())[4], 10000000)
         self.assertRaises(GraphException, graph.bfs, 9, 4)
 
+    def test_vectorized_bfs(self):
+        graph = read_graph("test_in_graph.txt")
+        self.assertEqual(graph.bfs(0, 4, engine="vectorized"), graph.bfs(0, 4))
+        self.assertEqual(graph.bfs(0, 1, engine="vectorized"), graph.bfs(0, 1))
+        self.assertEqual(graph.bfs(4, 0, engine="vectorized"), graph.bfs(4, 0))
+        self.assertRaises(GraphException, graph.bfs, 9, 4, engine="vectorized")
+        self.assertRaises(GraphException, graph.bfs, 0, 4, engine="gpu")
+        # Sparse graphs are mostly searched top-down, dense graphs switch to the bottom-up direction
+        for no_vertices, no_edges in [(300, 600), (300, 20000)]:
+            random_graph = create_random_graph(no_vertices, no_edges)
+            for start, end in [(0, None), (1, 2), (3, 299)]:
+                self.assertEqual(random_graph.bfs(start, end, engine="vectorized"), random_graph.bfs(start, end))
+
+    def test_bfs_layers(self):
+        graph = read_graph("test_in_graph.txt")
+        self.assertEqual(list(graph.bfs_layers(0)), [(0,), (1,), (2, 3)])
+        self.assertEqual(list(graph.bfs_layers(4)), [(4,)])
+        layers = graph.bfs_layers(0)
+        self.assertEqual(next(layers), (0,))
+        self.assertEqual(next(layers), (1,))
+        self.assertRaises(GraphException, list, graph.bfs_layers(9))
+        random_graph = create_random_graph(100, 300)
+        _, _, dist = random_graph.bfs(0, None)
+        for depth, level in enumerate(random_graph.bfs_layers(0)):
+            self.assertEqual(sorted(level), sorted(vertex for vertex in dist if dist[vertex] == depth))
+
+    def test_k_hop_neighbourhood(self):
+        graph = read_graph("test_in_graph.txt")
+        neighbourhood = graph.k_hop_neighbourhood(0, 1)
+        self.assertEqual(list(neighbourhood.get_all_vertices()), [0, 1])
+        self.assertEqual(sorted(neighbourhood.get_all_edges()), [(0, 0, 1), (0, 1, 7)])
+        neighbourhood = graph.k_hop_neighbourhood(1, 5)
+        self.assertEqual(sorted(neighbourhood.get_all_vertices()), [1, 2, 3])
+        self.assertEqual(sorted(neighbourhood.get_all_edges()), [(1, 2, 2), (1, 3, 8), (2, 1, -1), (2, 3, 5)])
+        self.assertEqual(graph.k_hop_neighbourhood(0, 0).get_no_edges(), 1)
+        self.assertRaises(GraphException, graph.k_hop_neighbourhood, 9, 1)
+        self.assertRaises(GraphException, graph.k_hop_neighbourhood, 0, -1)
+
     def test_lowest_length_path(self):
         graph = read_graph("test_in_graph.txt")
         path = graph.lowest_length_path(0, 3)
@@ -270,6 +310,92 @@ class TestTripleDictGraph(unittest.TestCase):
         self.assertRaises(GraphException, graph.lowest_length_path, 0, 4)
         self.assertRaises(GraphException, graph.lowest_length_path, 4, 0)
 
+    def test_bfs_many(self):
+        graph = read_graph("test_in_graph.txt")
+        dist = graph.bfs_many([0, 1, 4], [0, 1, 2, 3, 4])
+        self.assertEqual(dist.tolist()[0][:4], [0, 1, 2, 2])
+        self.assertEqual(dist.tolist()[1][1:4], [0, 1, 1])
+        self.assertGreater(dist[0][4], 10000000)
+        self.assertGreater(dist[2][0], 10000000)
+        paths = graph.bfs_many([0], [3, 4], paths=True)
+        self.assertEqual(paths, [[[0, 1, 3], None]])
+        self.assertRaises(GraphException, graph.bfs_many, [9])
+        self.assertRaises(GraphException, graph.bfs_many, [0], [9])
+        # More sources than fit in a single machine word must give the same lengths as the simple BFS
+        random_graph = create_random_graph(150, 600)
+        dist = random_graph.bfs_many(range(150))
+        for source in range(0, 150, 7):
+            _, _, expected = random_graph.bfs(source, None)
+            self.assertEqual(dist[source].tolist(), list(expected.values()))
+            for target, path in enumerate(random_graph.bfs_many([source], paths=True)[0]):
+                if path is not None:
+                    self.assertEqual(len(path) - 1, expected[target])
+                    self.assertTrue(all(random_graph.is_edge_in_graph(a, b) for a, b in zip(path, path[1:])))
+
+    def test_bfs_many_last_vertices_without_inbound_edges(self):
+        # The last vertices have no inbound edges, so their (empty) segments come after the last inbound edge
+        graph = TripleDictGraph(4)
+        graph.add_edge(0, 2, 1)
+        graph.add_edge(1, 2, 1)
+        self.assertEqual(graph.bfs_many([0, 1]).tolist(), [[0, INFINITY, 1, INFINITY], [INFINITY, 0, 1, INFINITY]])
+        self.assertEqual(graph.bfs_many([1], [2], paths=True), [[[1, 2]]])
+        # Sparse random graphs have many vertices without inbound edges, also at the end
+        for _ in range(30):
+            random_graph = create_random_graph(40, 30)
+            dist = random_graph.bfs_many(range(40))
+            for source in range(40):
+                _, _, expected = random_graph.bfs(source, None)
+                self.assertEqual(dist[source].tolist(), list(expected.values()))
+
+    def test_is_reachable(self):
+        graph = read_graph("test_in_graph.txt")
+        self.assertTrue(graph.is_reachable(0, 3))
+        self.assertTrue(graph.is_reachable(2, 1))
+        self.assertTrue(graph.is_reachable(4, 4))
+        self.assertFalse(graph.is_reachable(3, 0))
+        self.assertFalse(graph.is_reachable(0, 4))
+        self.assertRaises(GraphException, graph.is_reachable, 0, 9)
+        # The index follows the changes of the graph
+        graph.add_edge(3, 4, 1)
+        self.assertTrue(graph.is_reachable(0, 4))
+        self.assertRaises(GraphException, graph.lowest_length_path, 4, 0)
+        # A query on a changed graph does not rebuild the index
+        index = graph.get_reachability_index()
+        self.assertTrue(index.is_up_to_date())
+        graph.add_edge(4, 0, 1)
+        self.assertEqual(graph.lowest_length_path(4, 0), [4, 0])
+        self.assertFalse(index.is_up_to_date())
+        graph.remove_edge(4, 0)
+        graph.remove_edge(1, 3)
+        graph.remove_edge(2, 3)
+        self.assertFalse(graph.is_reachable(0, 4))
+        # Both the transitive closure and the interval labels agree with the BFS
+        for closure_limit in [CLOSURE_LIMIT, 0]:
+            random_graph = create_random_graph(60, 80)
+            index = ReachabilityIndex(random_graph, closure_limit)
+            for start in range(0, 60, 5):
+                visited, _, _ = random_graph.bfs(start, None)
+                for end in range(60):
+                    self.assertEqual(index.is_reachable(start, end), visited[end])
+
+    def test_weakly_connected_components(self):
+        graph = read_graph("test_in_graph.txt")
+        self.assertEqual(graph.weakly_connected_components(), [[0, 1, 2, 3], [4]])
+        self.assertEqual(weakly_connected_components_from_file("test_in_graph.txt"), [[0, 1, 2, 3], [4]])
+        graph.add_vertex(10)
+        graph.add_edge(10, 4, 1)
+        self.assertEqual(graph.weakly_connected_components(), [[0, 1, 2, 3], [4, 10]])
+        # The same components as a search which ignores the orientation of the edges
+        random_graph = create_random_graph(50, 40)
+        undirected = random_graph.get_copy_of_graph()
+        for _from, _to, _cost in random_graph.get_all_edges():
+            if not undirected.is_edge_in_graph(_to, _from):
+                undirected.add_edge(_to, _from, _cost)
+        expected = sorted(sorted(c) for c in undirected.find_all_scc())
+        self.assertEqual(sorted(random_graph.weakly_connected_components()), expected)
+        write_graph(random_graph, "test_out_graph.txt")
+        self.assertEqual(sorted(weakly_connected_components_from_file("test_out_graph.txt")), expected)
+
     def test_find_all_scc(self):
         graph = TripleDictGraph(5)
         # The strongly connected components of the following graph are: [0, 1, 2], [3], [4]
@@ -290,6 +416,99 @@ class TestTripleDictGraph(unittest.TestCase):
         self.assertTrue([1, 2] in scc or [2, 1] in scc)
         self.assertIn([3], scc)
         self.assertIn([4], scc)
+        # The components come in topological order
+        self.assertEqual(scc, [[4], [0], [1, 2], [3]])
+        # Long paths do not hit the recursion limit and the vertices do not have to be 0, 1, ..., n - 1
+        graph = TripleDictGraph()
+        for vertex in range(10000):
+            graph.add_vertex(3 * vertex + 7)
+        for vertex in range(9999):
+            graph.add_edge(3 * vertex + 7, 3 * vertex + 10, 1)
+        graph.add_edge(3 * 9999 + 7, 3 * 5000 + 7, 1)
+        scc = graph.find_all_scc()
+        self.assertEqual(len(scc), 5001)
+        self.assertEqual(scc[-1], [3 * vertex + 7 for vertex in range(5000, 10000)])
+        # The same components as the ones found by Kosaraju's algorithm
+        for _ in range(20):
+            random_graph = create_random_graph(40, 60)
+            self.assertEqual(sorted(sorted(c) for c in random_graph.find_all_scc()),
+                             sorted(sorted(c) for c in random_graph.kosaraju()))
+
+    def test_parallel_find_all_scc(self):
+        graph = read_graph("test_in_graph.txt")
+        self.assertEqual(sorted(sorted(c) for c in graph.find_all_scc(parallel=2)), [[0], [1, 2], [3], [4]])
+        self.assertRaises(GraphException, graph.find_all_scc, parallel=0)
+        self.assertEqual(TripleDictGraph().find_all_scc(parallel=1), [])
+        # Large enough to be split by the workers instead of being solved by a single one
+        random_graph = create_random_graph(6000, 9000)
+        for vertex in range(0, 5999, 3):
+            if not random_graph.is_edge_in_graph(vertex, vertex + 1):
+                random_graph.add_edge(vertex, vertex + 1, 1)
+        self.assertEqual(sorted(sorted(c) for c in random_graph.find_all_scc(parallel=2)),
+                         sorted(sorted(c) for c in random_graph.kosaraju()))
+
+    def test_condensation(self):
+        graph = read_graph("test_in_graph.txt")
+        graph.add_edge(0, 2, 4)
+        dag = graph.condensation()
+        self.assertEqual(dag.get_no_vertices(), 4)
+        self.assertEqual(dag.get_no_edges(), 2)
+        self.assertEqual([dag.get_component_of(vertex) for vertex in range(5)], [1, 2, 2, 3, 0])
+        self.assertEqual(dag.get_component_vertices(2), [1, 2])
+        self.assertEqual(dag.sizes.tolist(), [1, 1, 2, 1])
+        self.assertEqual(list(dag.get_outbound_neighbours(1)), [2])
+        self.assertEqual(list(dag.get_inbound_neighbours(3)), [2])
+        self.assertEqual(list(dag.get_inbound_neighbours(0)), [])
+        # 0->1 (7) and 0->2 (4) become a single edge, the self loop 0->0 and the edges inside {1, 2} disappear
+        self.assertEqual(dag.get_edge_costs(1, 2), (4, 7, 11))
+        self.assertEqual(dag.get_edge_costs(2, 3), (5, 8, 13))
+        self.assertRaises(GraphException, dag.get_edge_costs, 1, 3)
+        self.assertRaises(GraphException, dag.get_component_of, 9)
+        self.assertEqual(dag.topological_sort(), [0, 1, 2, 3])
+        for _ in range(10):
+            random_graph = create_random_graph(30, 45)
+            dag = random_graph.condensation()
+            self.assertEqual(sorted(sorted(dag.get_component_vertices(c)) for c in dag.get_all_vertices()),
+                             sorted(sorted(c) for c in random_graph.kosaraju()))
+            for _from, _to, _ in random_graph.get_all_edges():
+                c1, c2 = dag.get_component_of(_from), dag.get_component_of(_to)
+                self.assertLessEqual(c1, c2)
+                if c1 != c2:
+                    self.assertIn(c2, dag.get_outbound_neighbours(c1))
+
+    def test_scc_index(self):
+        graph = read_graph("test_in_graph.txt")
+        index = graph.get_scc_index()
+        self.assertIs(graph.get_scc_index(), index)
+        self.assertEqual(index.get_components(), [[4], [0], [1, 2], [3]])
+        self.assertEqual(index.component_of(1), index.component_of(2))
+        self.assertNotEqual(index.component_of(0), index.component_of(1))
+        self.assertRaises(GraphException, index.component_of, 9)
+        # 3 -> 0 closes the cycle 0 -> 1 -> 3 -> 0
+        graph.add_edge(3, 0, 1)
+        self.assertEqual(index.get_no_components(), 2)
+        self.assertEqual(index.component_of(0), index.component_of(3))
+        graph.add_vertex(5)
+        graph.add_edge(5, 4, 1)
+        graph.add_edge(4, 0, 1)
+        self.assertEqual([sorted(c) for c in index.get_components()], [[5], [4], [0, 1, 2, 3]])
+        graph.remove_edge(3, 0)
+        self.assertEqual(index.get_components(), [[5], [4], [0], [1, 2], [3]])
+        # Random insertions (with a few rebuilds from scratch along the way) must give the same components as
+        # recomputing them every time
+        graph = TripleDictGraph(40)
+        index = SCCIndex(graph, max_updates=25)
+        for step in range(200):
+            _from, _to = random.randrange(40), random.randrange(40)
+            if not graph.is_edge_in_graph(_from, _to):
+                graph.add_edge(_from, _to, 1)
+            if step % 10 == 0:
+                self.assertEqual(sorted(sorted(c) for c in index.get_components()),
+                                 sorted(sorted(c) for c in graph.find_all_scc()))
+                components = index.get_components()
+                position = {vertex: i for i, c in enumerate(components) for vertex in c}
+                for a, b, _ in graph.get_all_edges():
+                    self.assertLessEqual(position[a], position[b])
 
     def test_kosaraju(self):
         graph = read_graph("test_in_graph.txt")
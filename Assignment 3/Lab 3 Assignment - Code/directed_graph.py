@@ -1,13 +1,616 @@
+import heapq
+import json
+import os
 import random
+import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
-from queue import PriorityQueue
 
 import graphviz
+import numpy
 
 from errors import GraphException
 
 MAX_GRAPH_COST = 100  # We use this for the costs of the randomly generated graphs
 INFINITY = 999999999999999  # We use this to define the default value used as infinity
+TREE_CACHE_SIZE = 32  # The number of shortest path trees remembered by every graph
+NO_LANDMARKS = 8  # The default number of landmarks of a landmark (ALT) index
+WITNESS_SEARCH_LIMIT = 500  # The most vertices settled by a witness search of the contraction hierarchy
+DIAL_MAX_COST = 1000  # The largest edge cost for which Dijkstra's Algorithm uses a bucket queue (Dial's algorithm)
+DYNAMIC_TREE_REBUILD = 0.5  # The fraction of the vertices above which a dynamic tree is rebuilt instead of repaired
+FLOYD_WARSHALL_BLOCK = 64  # The number of intermediate vertices processed together by the blocked Floyd-Warshall
+FLOYD_WARSHALL_CHUNK = 1 << 15  # The number of matrix entries updated together by the blocked Floyd-Warshall
+
+
+class ShortestPathTree:
+    def __init__(self, root, direction, vertices, dist, parent):
+        """
+        The minimum cost walks between a root vertex and all the other vertices of a graph, as computed by
+        TripleDictGraph.shortest_path_tree. The vertices are numbered 0, 1, ..., n - 1 in the order given by
+        <vertices> and the tree is kept in 2 flat lists indexed by these numbers.
+        :param root: The root of the tree; int
+        :param direction: "out" - the walks start in the root; "in" - the walks end in the root
+        :param vertices: The vertices of the graph; list (index -> vertex)
+        :param dist: The cost of the minimum cost walk between the root and every vertex (INFINITY if there is no
+        walk); list
+        :param parent: The index of the next vertex towards the root on the walk of every vertex (-1 for the root
+        and the vertices without a walk); list
+        """
+        self.root = root
+        self.direction = direction
+        self.vertices = vertices
+        self.index = {vertex: i for i, vertex in enumerate(vertices)}
+        self.dist = dist
+        self.parent = parent
+
+    def __get_index(self, vertex):
+        """
+        Returns the number of the given vertex or raises a GraphException if it is not in the tree.
+        """
+        if vertex not in self.index:
+            raise GraphException(f"ERROR: Vertex {vertex} is not in the graph.")
+        return self.index[vertex]
+
+    def get_cost(self, vertex):
+        """
+        Returns the cost of the minimum cost walk between the root and the given vertex (INFINITY if there is none).
+        """
+        return self.dist[self.__get_index(vertex)]
+
+    def get_walk(self, vertex):
+        """
+        Returns the minimum cost walk between the root and the given vertex as a list: from <vertex> to the root
+        for an "in" tree (like reverse_dijkstra) and from the root to <vertex> for an "out" tree.
+        :raise: GraphException - if the vertex is not in the graph or there is no walk between it and the root
+        """
+        i = self.__get_index(vertex)
+        if self.dist[i] == INFINITY:
+            raise GraphException(f"ERROR: Vertex {vertex} is NOT accessible from vertex {self.root}.")
+        walk = []
+        while i != -1:
+            walk.append(self.vertices[i])
+            i = self.parent[i]
+        return walk if self.direction == "in" else walk[::-1]
+
+
+class AllPairsWalks:
+    def __init__(self, vertices, dist, next_hop):
+        """
+        The minimum cost walks between all the pairs of vertices of a graph, as computed by
+        TripleDictGraph.floyd_warshall. The vertices are numbered 0, 1, ..., n - 1 in the order given by <vertices>.
+        :param vertices: The vertices of the graph; list (index -> vertex)
+        :param dist: numpy matrix with the cost of the minimum cost walk between every 2 vertices (inf if there is
+        no walk)
+        :param next_hop: numpy matrix with the index of the vertex after the first one on every minimum cost walk
+        (-1 if there is no walk)
+        """
+        self.vertices = vertices
+        self.index = {vertex: i for i, vertex in enumerate(vertices)}
+        self.dist = dist
+        self.next_hop = next_hop
+
+    def __get_index(self, vertex):
+        """
+        Returns the number of the given vertex or raises a GraphException if it is not in the graph.
+        """
+        if vertex not in self.index:
+            raise GraphException(f"ERROR: Vertex {vertex} is not in the graph.")
+        return self.index[vertex]
+
+    def get_cost(self, start, end):
+        """
+        Returns the cost of the minimum cost walk from <start> to <end> (INFINITY if there is none).
+        """
+        cost = self.dist[self.__get_index(start), self.__get_index(end)]
+        if cost == numpy.inf:
+            return INFINITY
+        return int(cost) if cost.is_integer() else float(cost)
+
+    def get_walk(self, start, end):
+        """
+        Returns the minimum cost walk from <start> to <end> as a list (the same format as bellman).
+        :raise: GraphException - if a vertex is not in the graph or <end> is not accessible from <start>
+        """
+        i, j = self.__get_index(start), self.__get_index(end)
+        if self.dist[i, j] == numpy.inf:
+            raise GraphException(f"ERROR: The vertex {end} is NOT accessible from vertex {start}.")
+        walk = [start]
+        while i != j:
+            i = self.next_hop[i, j]
+            walk.append(self.vertices[i])
+        return walk
+
+
+class LandmarkIndex:
+    def __init__(self, vertices, landmarks, from_landmark, to_landmark):
+        """
+        Landmark index for the A* searches of TripleDictGraph.alt_walk. For a few landmark vertices L it keeps the
+        costs of the minimum cost walks from L to every vertex and from every vertex to L. By the triangle
+        inequality, the cost of any walk from v to t is at least d(L, t) - d(L, v) and at least d(v, L) - d(t, L),
+        which gives A* a lower bound of the remaining cost without searching the graph.
+        :param vertices: The vertices of the graph; list (index -> vertex)
+        :param landmarks: The landmark vertices; list
+        :param from_landmark: For every landmark, the costs from it to every vertex (by index); list of lists
+        :param to_landmark: For every landmark, the costs from every vertex (by index) to it; list of lists
+        """
+        self.vertices = vertices
+        self.index = {vertex: i for i, vertex in enumerate(vertices)}
+        self.landmarks = landmarks
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+
+    def lower_bound(self, vertex, end):
+        """
+        Returns a lower bound of the cost of any walk from <vertex> to <end> (0 if the landmarks give no bound).
+        """
+        v, t = self.index[vertex], self.index[end]
+        bound = 0
+        for from_l, to_l in zip(self.from_landmark, self.to_landmark):
+            # The bounds are only valid when both costs are known
+            if from_l[t] != INFINITY and from_l[v] != INFINITY:
+                bound = max(bound, from_l[t] - from_l[v])
+            if to_l[v] != INFINITY and to_l[t] != INFINITY:
+                bound = max(bound, to_l[v] - to_l[t])
+        return bound
+
+    def save(self, file_name):
+        """
+        Writes the index in a (JSON) file, e.g. next to the file of the graph (see landmark_index_file_name).
+        :param file_name: The name of the file
+        """
+        with open(file_name, 'w') as f:
+            json.dump({"vertices": self.vertices, "landmarks": self.landmarks,
+                       "from_landmark": self.from_landmark, "to_landmark": self.to_landmark}, f)
+
+    @staticmethod
+    def load(file_name):
+        """
+        Reads an index written by save.
+        :param file_name: The name of the file
+        :return: An instance of LandmarkIndex
+        """
+        with open(file_name, 'r') as f:
+            data = json.load(f)
+        return LandmarkIndex(data["vertices"], data["landmarks"], data["from_landmark"], data["to_landmark"])
+
+
+class ContractionHierarchy:
+    def __init__(self, graph):
+        """
+        Contraction hierarchy of a (read-only) graph, for very fast minimum cost walk queries. The vertices are
+        contracted one by one, the least important first (by edge difference: the number of shortcuts contracting
+        the vertex needs minus the number of edges it removes, updated lazily). Contracting a vertex v removes it
+        and, for every pair of edges u -> v -> w, adds the shortcut u -> w unless a witness search (a small
+        Dijkstra search from u avoiding v) finds a walk from u to w which is not more expensive. A query then only
+        has to follow edges towards more important vertices, from both ends (see find_walk).
+        The hierarchy is built for the current version of the graph; it cannot be used after the graph changes.
+        :param graph: The graph; an instance of TripleDictGraph
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        if graph.has_negative_costs():
+            raise GraphException("ERROR: Cannot build a contraction hierarchy. The graph has negative edges.")
+        self.__graph = graph
+        self.__version = graph.get_version()
+        # The edges between the vertices which are not contracted yet: vertex -> {neighbour: (cost, middle)}, where
+        # middle is the contracted vertex a shortcut replaces (None for the edges of the graph)
+        self.__out = {vertex: {} for vertex in graph.get_all_vertices()}
+        self.__in = {vertex: {} for vertex in graph.get_all_vertices()}
+        for _from, _to, cost in graph.get_all_edges():
+            if _from != _to:
+                self.__out[_from][_to] = self.__in[_to][_from] = (cost, None)
+        # The edges of every vertex towards the vertices contracted after it (the upward edges used by queries)
+        self.__up_out, self.__up_in = {}, {}
+        self.rank = {}
+        self.no_shortcuts = 0
+        contracted_neighbours = dict.fromkeys(self.__out, 0)
+        heap = [(self.__priority(vertex, contracted_neighbours), vertex) for vertex in self.__out]
+        heapq.heapify(heap)
+        while heap:
+            _, vertex = heapq.heappop(heap)
+            # Lazy update: the priority may have grown since it was computed
+            priority = self.__priority(vertex, contracted_neighbours)
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, vertex))
+                continue
+            for u, w, cost in self.__shortcuts(vertex):
+                if w not in self.__out[u] or cost < self.__out[u][w][0]:
+                    self.__out[u][w] = self.__in[w][u] = (cost, vertex)
+                    self.no_shortcuts += 1
+            self.rank[vertex] = len(self.rank)
+            self.__up_out[vertex] = self.__out.pop(vertex)
+            self.__up_in[vertex] = self.__in.pop(vertex)
+            for neighbour in self.__up_out[vertex]:
+                del self.__in[neighbour][vertex]
+                contracted_neighbours[neighbour] += 1
+            for neighbour in self.__up_in[vertex]:
+                del self.__out[neighbour][vertex]
+                contracted_neighbours[neighbour] += 1
+
+    def __priority(self, vertex, contracted_neighbours):
+        """
+        The importance of a vertex: its edge difference plus the number of its contracted neighbours (which spreads
+        the contractions uniformly over the graph). Less important vertices are contracted first.
+        """
+        removed = len(self.__out[vertex]) + len(self.__in[vertex])
+        return len(self.__shortcuts(vertex)) - removed + contracted_neighbours[vertex]
+
+    def __shortcuts(self, vertex):
+        """
+        Finds the shortcuts needed to contract the given vertex.
+        :return: List of (u, w, cost) triples; the shortcut u -> w with the given cost is needed
+        """
+        shortcuts = []
+        for u, (cost_in, _) in self.__in[vertex].items():
+            candidates = {w: cost_in + cost_out for w, (cost_out, _) in self.__out[vertex].items() if w != u}
+            if not candidates:
+                continue
+            limit = max(candidates.values())
+            # Witness search: the minimum cost walks from u which avoid <vertex>, up to the largest candidate cost
+            dist = {u: 0}
+            heap = [(0, u)]
+            settled = 0
+            while heap and settled < WITNESS_SEARCH_LIMIT:
+                cost, current = heapq.heappop(heap)
+                if cost > dist[current]:
+                    continue
+                if cost > limit:
+                    break
+                settled += 1
+                for neighbour, (edge_cost, _) in self.__out[current].items():
+                    if neighbour == vertex:
+                        continue
+                    if cost + edge_cost < dist.get(neighbour, INFINITY):
+                        dist[neighbour] = cost + edge_cost
+                        heapq.heappush(heap, (cost + edge_cost, neighbour))
+            for w, cost in candidates.items():
+                if dist.get(w, INFINITY) > cost:
+                    shortcuts.append((u, w, cost))
+        return shortcuts
+
+    def find_walk(self, start, end):
+        """
+        Finds the minimum cost walk between vertex <start> and vertex <end>: a forward search from <start> and a
+        backward search from <end>, both following only edges towards more important vertices, meet in the most
+        important vertex of the walk. The shortcuts of the walk found are then unpacked into edges of the graph.
+        :param start: The starting vertex; int
+        :param end: The ending vertex; int
+        :return: The minimum cost walk from <start> to <end> as a list (the same format as reverse_dijkstra)
+        :raise: GraphException - if the graph changed after the hierarchy was built
+        :raise: GraphException - if one of the given vertices is not in the graph
+        :raise: GraphException - if the vertex <end> is not accessible from the vertex <start>
+        """
+        if self.__graph.get_version() != self.__version:
+            raise GraphException("ERROR: The graph changed after the contraction hierarchy was built.")
+        if start not in self.rank:
+            raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
+        if end not in self.rank:
+            raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
+        dist_forward, prev = self.__upward_search(start, self.__up_out)
+        dist_backward, next_vertex = self.__upward_search(end, self.__up_in)
+        best, meeting_vertex = INFINITY, None
+        for vertex, cost in dist_forward.items():
+            if vertex in dist_backward and cost + dist_backward[vertex] < best:
+                best, meeting_vertex = cost + dist_backward[vertex], vertex
+        if meeting_vertex is None:
+            raise GraphException(f"ERROR: Vertex {start} is NOT accessible from vertex {end}.")
+        # The walk through the hierarchy, made of edges of the graph and shortcuts
+        walk = []
+        current = meeting_vertex
+        while current is not None:
+            walk.append(current)
+            current = prev[current]
+        walk.reverse()
+        current = next_vertex[meeting_vertex]
+        while current is not None:
+            walk.append(current)
+            current = next_vertex[current]
+        unpacked = [walk[0]]
+        for _from, _to in zip(walk, walk[1:]):
+            unpacked.extend(self.__unpack(_from, _to))
+        return unpacked
+
+    @staticmethod
+    def __upward_search(source, edges):
+        """
+        Dijkstra search from <source> following the given upward edges; since it only goes up in the hierarchy it
+        settles few vertices.
+        :return: 2 dictionaries: the costs of the reached vertices and the previous vertex of every reached vertex
+        """
+        dist, prev = {source: 0}, {source: None}
+        heap = [(0, source)]
+        while heap:
+            cost, vertex = heapq.heappop(heap)
+            if cost > dist[vertex]:
+                continue
+            for neighbour, (edge_cost, _) in edges[vertex].items():
+                if cost + edge_cost < dist.get(neighbour, INFINITY):
+                    dist[neighbour] = cost + edge_cost
+                    prev[neighbour] = vertex
+                    heapq.heappush(heap, (cost + edge_cost, neighbour))
+        return dist, prev
+
+    def __unpack(self, _from, _to):
+        """
+        Replaces the edge or shortcut <_from> -> <_to> of the hierarchy by the walk of graph edges it stands for.
+        :return: The vertices of the walk after <_from>; list
+        """
+        unpacked = []
+        stack = [(_from, _to)]
+        while stack:
+            _from, _to = stack.pop()
+            # An edge is stored with the less important of its 2 ends
+            if self.rank[_from] < self.rank[_to]:
+                middle = self.__up_out[_from][_to][1]
+            else:
+                middle = self.__up_in[_to][_from][1]
+            if middle is None:
+                unpacked.append(_to)
+            else:
+                stack.append((middle, _to))
+                stack.append((_from, middle))
+        return unpacked
+
+
+class GraphListener:
+    """
+    Base class for the objects which have to follow the changes of a graph (indexes, maintained trees). A listener
+    is attached with TripleDictGraph.add_listener and each of the functions below is called right after the
+    corresponding change was made. By default, all the changes are ignored.
+    """
+
+    def on_vertex_added(self, vertex):
+        pass
+
+    def on_vertex_removed(self, vertex):
+        pass
+
+    def on_edge_added(self, _from, _to, cost):
+        pass
+
+    def on_edge_removed(self, _from, _to):
+        pass
+
+    def on_edge_cost_changed(self, _from, _to, old_cost, new_cost):
+        pass
+
+
+class DynamicShortestPathTree(GraphListener):
+    def __init__(self, graph, root, direction):
+        """
+        A shortest path tree (see ShortestPathTree) which repairs itself as the graph changes, created by
+        TripleDictGraph.maintain_shortest_path_tree. The tree uses the "tree direction" of the edges: from the root
+        towards the other vertices for an "out" tree and the other way around for an "in" tree.
+        A cheaper (or new) edge a -> b only matters if it gives b a cheaper walk; the improvement is then spread by
+        a Dijkstra search starting from b, which stops where nothing improves. A more expensive (or removed) edge
+        a -> b only matters if it is in the tree; then only the subtree of b can change (Ramalingam-Reps): its
+        vertices are given the best walks through the rest of the tree and a Dijkstra search restricted to the
+        subtree settles them. So the cost of an update depends on the part of the tree which changes. The tree is
+        rebuilt from scratch only as a fallback: when the subtree has more than DYNAMIC_TREE_REBUILD of the
+        vertices, and (at the next query) after a vertex is removed or a negative cost edge appears.
+        :param graph: The graph; an instance of TripleDictGraph (the tree must be attached to it as a listener)
+        :param root: The root of the tree; int
+        :param direction: "out" - the walks start in the root; "in" - the walks end in the root
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        self.__graph = graph
+        self.root = root
+        self.direction = direction
+        self.no_repairs = 0
+        self.no_rebuilds = 0
+        self.__dist, self.__parent, self.__children = None, None, None
+        self.__rebuild()
+
+    def __rebuild(self):
+        """
+        Computes the tree from scratch. If the graph has negative cost edges, this fails with a GraphException and
+        the tree stays outdated.
+        """
+        self.__dist = None
+        tree = self.__graph.shortest_path_tree(self.root, self.direction)
+        self.__dist = dict(zip(tree.vertices, tree.dist))
+        self.__parent = {vertex: None if parent == -1 else tree.vertices[parent]
+                         for vertex, parent in zip(tree.vertices, tree.parent)}
+        self.__children = {vertex: set() for vertex in tree.vertices}
+        for vertex, parent in self.__parent.items():
+            if parent is not None:
+                self.__children[parent].add(vertex)
+        self.no_rebuilds += 1
+
+    def __successors(self, vertex):
+        """
+        Returns the neighbours of the given vertex in the tree direction, with the costs of the edges.
+        """
+        if self.direction == "out":
+            return self.__graph.get_outbound_neighbours_with_cost(vertex)
+        return self.__graph.get_inbound_neighbours_with_cost(vertex)
+
+    def __predecessors(self, vertex):
+        """
+        Returns the vertices which have the given vertex as neighbour in the tree direction, with the costs of the
+        edges.
+        """
+        if self.direction == "out":
+            return self.__graph.get_inbound_neighbours_with_cost(vertex)
+        return self.__graph.get_outbound_neighbours_with_cost(vertex)
+
+    def __set_parent(self, vertex, parent):
+        if self.__parent[vertex] is not None:
+            self.__children[self.__parent[vertex]].discard(vertex)
+        self.__parent[vertex] = parent
+        if parent is not None:
+            self.__children[parent].add(vertex)
+
+    def __spread(self, heap, allowed=None):
+        """
+        Dijkstra search from the vertices of the given heap (pairs (cost, vertex)), only improving the vertices of
+        <allowed> (all the vertices if None).
+        """
+        dist = self.__dist
+        while heap:
+            cost, vertex = heapq.heappop(heap)
+            if cost > dist[vertex]:
+                continue
+            for neighbour, edge_cost in self.__successors(vertex):
+                if (allowed is None or neighbour in allowed) and cost + edge_cost < dist[neighbour]:
+                    dist[neighbour] = cost + edge_cost
+                    self.__set_parent(neighbour, vertex)
+                    heapq.heappush(heap, (cost + edge_cost, neighbour))
+
+    def __tree_edge(self, _from, _to):
+        """
+        Returns the ends of the given edge of the graph in the tree direction.
+        """
+        return (_from, _to) if self.direction == "out" else (_to, _from)
+
+    def __decreased(self, _from, _to, cost):
+        """
+        Repairs the tree after the edge <_from> -> <_to> became cheaper (or was added) and now has the given cost.
+        """
+        if self.__dist is None:
+            return
+        if cost < 0:
+            self.__dist = None
+            return
+        tail, head = self.__tree_edge(_from, _to)
+        if self.__dist[tail] == INFINITY or self.__dist[tail] + cost >= self.__dist[head]:
+            return
+        self.__dist[head] = self.__dist[tail] + cost
+        self.__set_parent(head, tail)
+        self.__spread([(self.__dist[head], head)])
+        self.no_repairs += 1
+
+    def __increased(self, _from, _to):
+        """
+        Repairs the tree after the edge <_from> -> <_to> became more expensive (or was removed).
+        """
+        if self.__dist is None:
+            return
+        tail, head = self.__tree_edge(_from, _to)
+        if self.__parent[head] != tail:
+            return
+        # The subtree of <head>: the only vertices whose walks used the edge
+        affected = {head}
+        stack = [head]
+        while stack:
+            for child in self.__children[stack.pop()]:
+                affected.add(child)
+                stack.append(child)
+        if len(affected) > DYNAMIC_TREE_REBUILD * len(self.__dist):
+            self.__rebuild()
+            return
+        dist = self.__dist
+        for vertex in affected:
+            dist[vertex] = INFINITY
+            self.__set_parent(vertex, None)
+        # Every vertex of the subtree first gets its best walk through a vertex outside of the subtree
+        heap = []
+        for vertex in affected:
+            for neighbour, edge_cost in self.__predecessors(vertex):
+                if neighbour not in affected and dist[neighbour] + edge_cost < dist[vertex]:
+                    dist[vertex] = dist[neighbour] + edge_cost
+                    self.__set_parent(vertex, neighbour)
+            if dist[vertex] != INFINITY:
+                heap.append((dist[vertex], vertex))
+        heapq.heapify(heap)
+        self.__spread(heap, affected)
+        self.no_repairs += 1
+
+    def on_vertex_added(self, vertex):
+        if self.__dist is not None:
+            self.__dist[vertex] = INFINITY
+            self.__parent[vertex] = None
+            self.__children[vertex] = set()
+
+    def on_vertex_removed(self, vertex):
+        self.__dist = None
+
+    def on_edge_added(self, _from, _to, cost):
+        self.__decreased(_from, _to, cost)
+
+    def on_edge_removed(self, _from, _to):
+        self.__increased(_from, _to)
+
+    def on_edge_cost_changed(self, _from, _to, old_cost, new_cost):
+        if new_cost < old_cost:
+            self.__decreased(_from, _to, new_cost)
+        elif new_cost > old_cost:
+            self.__increased(_from, _to)
+
+    def __get_dist(self, vertex):
+        """
+        Returns the cost of the given vertex, rebuilding the tree if it is outdated.
+        :raise: GraphException - if the vertex is not in the graph or the graph has negative cost edges
+        """
+        if self.__dist is None:
+            self.__rebuild()
+        if vertex not in self.__dist:
+            raise GraphException(f"ERROR: Vertex {vertex} is not in the graph.")
+        return self.__dist[vertex]
+
+    def get_cost(self, vertex):
+        """
+        Returns the cost of the minimum cost walk between the root and the given vertex (INFINITY if there is none).
+        """
+        return self.__get_dist(vertex)
+
+    def get_walk(self, vertex):
+        """
+        Returns the minimum cost walk between the root and the given vertex as a list: from <vertex> to the root
+        for an "in" tree (like reverse_dijkstra) and from the root to <vertex> for an "out" tree.
+        :raise: GraphException - if the vertex is not in the graph or there is no walk between it and the root
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        if self.__get_dist(vertex) == INFINITY:
+            raise GraphException(f"ERROR: Vertex {vertex} is NOT accessible from vertex {self.root}.")
+        walk = []
+        while vertex is not None:
+            walk.append(vertex)
+            vertex = self.__parent[vertex]
+        return walk if self.direction == "in" else walk[::-1]
+
+
+class BucketQueue:
+    def __init__(self, max_cost):
+        """
+        A priority queue for non-negative integer keys which never differ by more than <max_cost> (Dial's bucket
+        queue): a circular array of max_cost + 1 buckets, the key k being kept in the bucket k % (max_cost + 1).
+        Popping scans the buckets from the smallest key that may be in the queue, so a whole Dijkstra search takes
+        O(E + V * max_cost) bucket operations. The items of a bucket are kept in a small heap, so the items with
+        the same key are popped in the same order as from a binary heap of (key, item) pairs.
+        :param max_cost: The largest difference between 2 keys of the queue; int
+        """
+        self.__buckets = [[] for _ in range(max_cost + 1)]
+        self.__size = 0
+        self.__current = 0  # No key in the queue is smaller than this one
+
+    def __len__(self):
+        return self.__size
+
+    def push(self, key, item):
+        """
+        Adds the given item with the given key (an integer, possibly stored as a float) to the queue.
+        """
+        key = int(key)
+        if self.__size == 0 or key < self.__current:
+            self.__current = key
+        heapq.heappush(self.__buckets[key % len(self.__buckets)], item)
+        self.__size += 1
+
+    def pop(self):
+        """
+        Removes the item with the smallest key (the smallest item among those with that key) from the queue.
+        :return: A pair (key, item)
+        :raise: IndexError - if the queue is empty
+        """
+        if self.__size == 0:
+            raise IndexError("pop from an empty bucket queue")
+        buckets, current = self.__buckets, self.__current
+        while not buckets[current % len(buckets)]:
+            current += 1
+        self.__current = current
+        self.__size -= 1
+        return current, heapq.heappop(buckets[current % len(buckets)])
 
 
 class TripleDictGraph:
@@ -21,6 +624,24 @@ class TripleDictGraph:
         for i in range(no_vertices):
             self.__dict_in[i] = []
             self.__dict_out[i] = []
+        # Every change of the graph increments its version; the cached results are only valid for one version
+        self.__version = 0
+        self.__tree_cache = OrderedDict()
+        # The objects told about every change of the graph and the shortest path trees kept up to date by it
+        self.__listeners = []
+        self.__maintained_trees = {}
+        # The landmark index used by alt_walk and the version of the graph it was built for
+        self.__landmark_index = None
+        self.__landmark_index_version = None
+        # The edge arrays (see get_edge_arrays) and the version of the graph they were built for
+        self.__edge_arrays = None
+        self.__edge_arrays_version = None
+        # Running statistics of the edge costs, kept up to date by every change of the edges
+        self.__cost_counts = {}  # cost -> number of edges with that cost
+        self.__negative_costs = 0
+        self.__non_integer_costs = 0
+        self.__min_cost = None  # None if unknown (it is then recomputed from <cost_counts>)
+        self.__max_cost = None
 
     def get_no_vertices(self):
         """
@@ -34,6 +655,91 @@ class TripleDictGraph:
         """
         return len(self.__cost.keys())
 
+    def get_version(self):
+        """
+        Returns the version of the graph: a number which changes every time the graph is modified.
+        """
+        return self.__version
+
+    def add_listener(self, listener):
+        """
+        Attaches a listener to the graph; from now on it will be told about all the changes of the graph.
+        :param listener: An instance of GraphListener
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Detaches a listener from the graph.
+        :param listener: An instance of GraphListener which was attached to the graph
+        :raise: GraphException - if the listener is not attached to the graph
+        """
+        if listener not in self.__listeners:
+            raise GraphException("ERROR: The listener is not attached to the graph.")
+        self.__listeners.remove(listener)
+
+    def __count_cost(self, cost):
+        """
+        Updates the cost statistics after an edge with the given cost was added.
+        """
+        if self.__cost_counts:
+            if self.__min_cost is not None and cost < self.__min_cost:
+                self.__min_cost = cost
+            if self.__max_cost is not None and cost > self.__max_cost:
+                self.__max_cost = cost
+        else:
+            self.__min_cost = self.__max_cost = cost
+        self.__cost_counts[cost] = self.__cost_counts.get(cost, 0) + 1
+        if cost < 0:
+            self.__negative_costs += 1
+        if not is_integer_cost(cost):
+            self.__non_integer_costs += 1
+
+    def __discount_cost(self, cost):
+        """
+        Updates the cost statistics after an edge with the given cost was removed.
+        """
+        self.__cost_counts[cost] -= 1
+        if not self.__cost_counts[cost]:
+            del self.__cost_counts[cost]
+            # The minimum/maximum may have been the last edge with this cost; find it again when it is needed
+            if cost == self.__min_cost:
+                self.__min_cost = None
+            if cost == self.__max_cost:
+                self.__max_cost = None
+        if cost < 0:
+            self.__negative_costs -= 1
+        if not is_integer_cost(cost):
+            self.__non_integer_costs -= 1
+
+    def has_negative_costs(self):
+        """
+        Returns True if the graph has at least one edge with a negative cost; False otherwise. Takes O(1) time.
+        """
+        return self.__negative_costs > 0
+
+    def has_integer_costs(self):
+        """
+        Returns True if the costs of all the edges of the graph are integers; False otherwise. Takes O(1) time.
+        """
+        return self.__non_integer_costs == 0
+
+    def get_min_cost(self):
+        """
+        Returns the smallest cost of an edge in the graph or None if the graph has no edges.
+        """
+        if self.__min_cost is None and self.__cost_counts:
+            self.__min_cost = min(self.__cost_counts)
+        return self.__min_cost
+
+    def get_max_cost(self):
+        """
+        Returns the largest cost of an edge in the graph or None if the graph has no edges.
+        """
+        if self.__max_cost is None and self.__cost_counts:
+            self.__max_cost = max(self.__cost_counts)
+        return self.__max_cost
+
     def get_all_vertices(self):
         """
         Returns all the vertices from the graph using an iterator.
@@ -172,7 +878,13 @@ class TripleDictGraph:
         """
         if not self.is_edge_in_graph(_from, _to):
             raise GraphException("The edge does not exist in the graph.")
+        old_cost = self.__cost[(_from, _to)]
+        self.__discount_cost(old_cost)
         self.__cost[(_from, _to)] = new_cost
+        self.__count_cost(new_cost)
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_edge_cost_changed(_from, _to, old_cost, new_cost)
 
     def add_edge(self, _from, _to, cost):
         """
@@ -193,6 +905,10 @@ class TripleDictGraph:
         self.__dict_in[_to].append(_from)
         self.__dict_out[_from].append(_to)
         self.__cost[(_from, _to)] = cost
+        self.__count_cost(cost)
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_edge_added(_from, _to, cost)
 
     def remove_edge(self, _from, _to):
         """
@@ -211,7 +927,10 @@ class TripleDictGraph:
             raise GraphException(f"The vertex {_to} does not exist in the graph.")
         self.__dict_in[_to].remove(_from)
         self.__dict_out[_from].remove(_to)
-        del self.__cost[(_from, _to)]
+        self.__discount_cost(self.__cost.pop((_from, _to)))
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_edge_removed(_from, _to)
 
     def add_vertex(self, vertex):
         """
@@ -224,6 +943,9 @@ class TripleDictGraph:
             raise GraphException("The vertex already exists.")
         self.__dict_in[vertex] = []
         self.__dict_out[vertex] = []
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_vertex_added(vertex)
 
     def remove_vertex(self, vertex):
         """
@@ -245,8 +967,13 @@ class TripleDictGraph:
             if vertex in self.__dict_out[v]:
                 self.__dict_out[v] = [node for node in self.__dict_out[v] if node != vertex]
         # Now delete every edge which has the vertex <vertex> in it from <dict_cost>
+        for key, value in self.__cost.items():
+            if key[0] == vertex or key[1] == vertex:
+                self.__discount_cost(value)
         self.__cost = {key: value for (key, value) in self.__cost.items() if key[0] != vertex and key[1] != vertex}
-        # All that is left is to decrease the count of vertices
+        self.__version += 1
+        for listener in self.__listeners:
+            listener.on_vertex_removed(vertex)
 
     def get_copy_of_graph(self):
         """
@@ -261,7 +988,9 @@ class TripleDictGraph:
     def reverse_dijkstra(self, start, end):
         """
         Finds the minimum cost walk between vertex <start> and vertex <end> by using the backwards implementation of
-        Dijkstra's Algorithm.
+        Dijkstra's Algorithm. The backward search is not stopped at <start>: it computes the whole "in" tree of
+        <end>, which is kept in the tree cache (see shortest_path_tree), so the following walks to <end> are read
+        from the tree without searching the graph again.
         :param start: The starting vertex; int
         :param end: The ending vertex; int
         :return: The minimum cost walk from <start> to <end> as a list
@@ -273,124 +1002,807 @@ class TripleDictGraph:
             raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
         if not self.is_vertex_in_graph(end):
             raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
-        if any(cost < 0 for _, _, cost in self.get_all_edges()):
+        if self.has_negative_costs():
             raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
-        priority_queue = PriorityQueue()
-        next_vertex = {node: None for node in self.get_all_vertices()}
-        dist = {node: INFINITY for node in self.get_all_vertices()}
-        priority_queue.put((0, end))
-        dist[end] = 0
-        found = False
-        while not priority_queue.empty() and not found:
-            cost, vertex = priority_queue.get()
-            if cost > dist[vertex]:
-                # If we already have a walk smaller than what we have to currently process, then skip this step
-                continue
-            for neighbour in self.get_inbound_neighbours(vertex):
-                if dist[vertex] + self.get_cost_of_edge(neighbour, vertex) < dist[neighbour]:
-                    dist[neighbour] = dist[vertex] + self.get_cost_of_edge(neighbour, vertex)
-                    priority_queue.put((dist[neighbour], neighbour))
-                    next_vertex[neighbour] = vertex
-            if vertex == start:
-                found = True
-        if dist[start] == INFINITY:
+        tree = self.__maintained_trees.get((end, "in")) or self.shortest_path_tree(end, "in")
+        return tree.get_walk(start)
+
+    def dijkstra(self, start, end):
+        """
+        Finds the minimum cost walk between vertex <start> and vertex <end> by using the forward implementation of
+        Dijkstra's Algorithm. The walk has the same cost as the one found by reverse_dijkstra.
+        :param start: The starting vertex; int
+        :param end: The ending vertex; int
+        :return: The minimum cost walk from <start> to <end> as a list
+        :raise: GraphException - if one of the given vertices is not in the graph
+        :raise: GraphException - if the graph has negative cost edges
+        :raise: GraphException - if the vertex <end> is not accessible from the vertex <start>
+        """
+        if not self.is_vertex_in_graph(start):
+            raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
+        if not self.is_vertex_in_graph(end):
+            raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
+        if self.has_negative_costs():
+            raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
+        dist, prev = self.__dijkstra(start, backward=False, targets=(end,))
+        if dist[end] == INFINITY:
+            raise GraphException(f"ERROR: Vertex {end} is NOT accessible from vertex {start}.")
+        walk = []
+        current = end
+        while current is not None:
+            walk.append(current)
+            current = prev[current]
+        return walk[::-1]
+
+    def bidirectional_dijkstra(self, start, end):
+        """
+        Finds the minimum cost walk between vertex <start> and vertex <end> by running Dijkstra's Algorithm from
+        both ends at once: forward from <start> over the outbound edges and backward from <end> over the inbound
+        edges, always advancing the search whose next vertex is closer. Every edge which joins the 2 searches gives
+        a candidate walk; the search stops once the 2 next vertices are together at least as far as the best
+        candidate (mu), since no walk through unsettled vertices can then be cheaper. The walk has the same cost as
+        the one found by reverse_dijkstra.
+        :param start: The starting vertex; int
+        :param end: The ending vertex; int
+        :return: The minimum cost walk from <start> to <end> as a list
+        :raise: GraphException - if one of the given vertices is not in the graph
+        :raise: GraphException - if the graph has negative cost edges
+        :raise: GraphException - if the vertex <end> is not accessible from the vertex <start>
+        """
+        if not self.is_vertex_in_graph(start):
+            raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
+        if not self.is_vertex_in_graph(end):
+            raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
+        if self.has_negative_costs():
+            raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
+        if start == end:
+            return [start]
+        cost_of = self.__cost
+        dist_forward, dist_backward = {start: 0}, {end: 0}
+        prev, next_vertex = {start: None}, {end: None}
+        heap_forward, heap_backward = [(0, start)], [(0, end)]
+        best, meeting_vertex = INFINITY, None
+        while heap_forward and heap_backward and heap_forward[0][0] + heap_backward[0][0] < best:
+            forward = heap_forward[0][0] <= heap_backward[0][0]
+            if forward:
+                cost, vertex = heapq.heappop(heap_forward)
+                if cost > dist_forward[vertex]:
+                    continue
+                for neighbour in self.__dict_out[vertex]:
+                    new_cost = cost + cost_of[(vertex, neighbour)]
+                    if new_cost < dist_forward.get(neighbour, INFINITY):
+                        dist_forward[neighbour] = new_cost
+                        prev[neighbour] = vertex
+                        heapq.heappush(heap_forward, (new_cost, neighbour))
+                    if neighbour in dist_backward and dist_forward[neighbour] + dist_backward[neighbour] < best:
+                        best, meeting_vertex = dist_forward[neighbour] + dist_backward[neighbour], neighbour
+            else:
+                cost, vertex = heapq.heappop(heap_backward)
+                if cost > dist_backward[vertex]:
+                    continue
+                for neighbour in self.__dict_in[vertex]:
+                    new_cost = cost + cost_of[(neighbour, vertex)]
+                    if new_cost < dist_backward.get(neighbour, INFINITY):
+                        dist_backward[neighbour] = new_cost
+                        next_vertex[neighbour] = vertex
+                        heapq.heappush(heap_backward, (new_cost, neighbour))
+                    if neighbour in dist_forward and dist_forward[neighbour] + dist_backward[neighbour] < best:
+                        best, meeting_vertex = dist_forward[neighbour] + dist_backward[neighbour], neighbour
+        if meeting_vertex is None:
             raise GraphException(f"ERROR: Vertex {start} is NOT accessible from vertex {end}.")
         walk = []
-        current = start
+        current = meeting_vertex
+        while current is not None:
+            walk.append(current)
+            current = prev[current]
+        walk.reverse()
+        current = next_vertex[meeting_vertex]
         while current is not None:
             walk.append(current)
             current = next_vertex[current]
         return walk
 
-    def exist_negative_cost_cycles(self, start):
+    def build_landmark_index(self, no_landmarks=NO_LANDMARKS, landmarks=None, workers=None):
+        """
+        Builds a landmark index (see LandmarkIndex) for the graph and attaches it to the graph, so it is used by
+        the following alt_walk calls (until the graph changes). Every landmark needs 2 full Dijkstra searches; with
+        <workers> given, the landmarks are processed in parallel by that many worker processes.
+        :param no_landmarks: The number of landmarks, picked at random if <landmarks> is not given; int
+        :param landmarks: The landmark vertices; list or None
+        :param workers: The number of worker processes; None to do everything in the current process
+        :return: The index; an instance of LandmarkIndex
+        :raise: GraphException - if a landmark is not in the graph or the graph has negative cost edges
+        """
+        if self.has_negative_costs():
+            raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
+        vertices = list(self.get_all_vertices())
+        if landmarks is None:
+            landmarks = random.sample(vertices, min(no_landmarks, len(vertices)))
+        for landmark in landmarks:
+            if not self.is_vertex_in_graph(landmark):
+                raise GraphException(f"ERROR: Vertex {landmark} is not in the graph.")
+        if workers is None:
+            _set_worker_graph(self)
+            try:
+                results = [_landmark_costs(landmark) for landmark in landmarks]
+            finally:
+                _worker_graph.clear()
+        else:
+            # The graph is sent once to every worker, not once for every landmark
+            with ProcessPoolExecutor(max_workers=workers, initializer=_set_worker_graph,
+                                     initargs=(self,)) as executor:
+                results = list(executor.map(_landmark_costs, landmarks))
+        index = LandmarkIndex(vertices, list(landmarks), [result[0] for result in results],
+                              [result[1] for result in results])
+        self.set_landmark_index(index)
+        return index
+
+    def set_landmark_index(self, index):
+        """
+        Attaches a landmark index (e.g. one loaded from a file) to the graph. The index is used by alt_walk until
+        the graph changes.
+        :param index: An instance of LandmarkIndex, built for this graph
+        :raise: GraphException - if the index was built for a graph with other vertices
+        """
+        if index.vertices != list(self.get_all_vertices()):
+            raise GraphException("ERROR: The landmark index was built for another graph.")
+        self.__landmark_index, self.__landmark_index_version = index, self.__version
+
+    def alt_walk(self, start, end):
+        """
+        Finds the minimum cost walk between vertex <start> and vertex <end> with an A* search guided by the
+        landmark index of the graph (ALT: A*, landmarks and the triangle inequality). The search only looks at the
+        vertices which, according to the landmarks, may be on a walk cheaper than the one it already knows. If the
+        graph has no up to date landmark index, this is a plain forward Dijkstra search.
+        :param start: The starting vertex; int
+        :param end: The ending vertex; int
+        :return: The minimum cost walk from <start> to <end> as a list
+        :raise: GraphException - if one of the given vertices is not in the graph
+        :raise: GraphException - if the graph has negative cost edges
+        :raise: GraphException - if the vertex <end> is not accessible from the vertex <start>
+        """
+        if not self.is_vertex_in_graph(start):
+            raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
+        if not self.is_vertex_in_graph(end):
+            raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
+        if self.has_negative_costs():
+            raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
+        index = self.__landmark_index if self.__landmark_index_version == self.__version else None
+        cost_of = self.__cost
+        dist, prev = {start: 0}, {start: None}
+        bounds = {start: index.lower_bound(start, end) if index else 0}
+        heap = [(bounds[start], start)]
+        while heap:
+            key, vertex = heapq.heappop(heap)
+            cost = dist[vertex]
+            if key > cost + bounds[vertex]:
+                # A cheaper walk to this vertex was found after this entry was added
+                continue
+            if vertex == end:
+                break
+            for neighbour in self.__dict_out[vertex]:
+                new_cost = cost + cost_of[(vertex, neighbour)]
+                if new_cost < dist.get(neighbour, INFINITY):
+                    dist[neighbour] = new_cost
+                    prev[neighbour] = vertex
+                    if neighbour not in bounds:
+                        bounds[neighbour] = index.lower_bound(neighbour, end) if index else 0
+                    heapq.heappush(heap, (new_cost + bounds[neighbour], neighbour))
+        if end not in dist:
+            raise GraphException(f"ERROR: Vertex {start} is NOT accessible from vertex {end}.")
+        walk = []
+        current = end
+        while current is not None:
+            walk.append(current)
+            current = prev[current]
+        return walk[::-1]
+
+    def k_shortest_paths(self, start, end, k):
+        """
+        Finds the <k> cheapest loopless walks (paths) from vertex <start> to vertex <end> with Yen's algorithm.
+        Every new path is searched as a deviation from the last one found: for every vertex of that path (the spur
+        vertex), the prefix before it (the root path, whose cost is kept from the prefix costs of the path) is
+        extended with the cheapest walk from the spur vertex to <end> which avoids the root path and the edges
+        used by the paths found before with the same root path. These spur searches are A* searches guided by the
+        reverse shortest path tree of <end> (an exact heuristic, since removing edges and vertices can only make
+        the walks more expensive); when the tree walk of the spur vertex avoids the forbidden edges and vertices it
+        is the answer and no search is needed at all. The candidates are kept in a heap.
+        :param start: The starting vertex; int
+        :param end: The ending vertex; int
+        :param k: The number of paths; int
+        :return: The paths (at most <k>, fewer if there are no more) as lists, by increasing cost; list
+        :raise: GraphException - if one of the given vertices is not in the graph or k is not positive
+        :raise: GraphException - if the graph has negative cost edges
+        :raise: GraphException - if the vertex <end> is not accessible from the vertex <start>
+        """
+        if k < 1:
+            raise GraphException(f"ERROR: The number of paths must be positive, not {k}.")
+        if not self.is_vertex_in_graph(start):
+            raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
+        tree = self.shortest_path_tree(end, "in")
+        paths = [tree.get_walk(start)]
+        cost_of = self.__cost
+        candidates = []
+        seen = {tuple(paths[0])}
+        while len(paths) < k:
+            last = paths[-1]
+            prefix_costs = [0]
+            for _from, _to in zip(last, last[1:]):
+                prefix_costs.append(prefix_costs[-1] + cost_of[(_from, _to)])
+            for i in range(len(last) - 1):
+                spur, root = last[i], last[:i + 1]
+                removed_edges = {(path[i], path[i + 1]) for path in paths if path[:i + 1] == root}
+                spur_walk = self.__spur_walk(tree, spur, end, set(root[:-1]), removed_edges)
+                if spur_walk is None:
+                    continue
+                path = root[:-1] + spur_walk[0]
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heapq.heappush(candidates, (prefix_costs[i] + spur_walk[1], path))
+            if not candidates:
+                break
+            paths.append(heapq.heappop(candidates)[1])
+        return paths
+
+    def __spur_walk(self, tree, spur, end, removed_vertices, removed_edges):
+        """
+        Finds the cheapest walk from <spur> to <end> avoiding the given vertices and the given edges, with an A*
+        search guided by the costs of the reverse shortest path tree <tree> of <end> (see k_shortest_paths).
+        :return: A pair (walk, cost) or None if there is no such walk
+        """
+        index, tree_dist, parent = tree.index, tree.dist, tree.parent
+        # The walk of the tree is the cheapest one if it is allowed
+        walk = [spur]
+        i = parent[index[spur]]
+        while i != -1 and tree.vertices[i] not in removed_vertices:
+            walk.append(tree.vertices[i])
+            i = parent[i]
+        if i == -1 and len(walk) > 1 and (spur, walk[1]) not in removed_edges:
+            return walk, tree_dist[index[spur]]
+        cost_of = self.__cost
+        dist, prev = {spur: 0}, {spur: None}
+        heap = [(tree_dist[index[spur]], spur)]
+        while heap:
+            key, vertex = heapq.heappop(heap)
+            cost = dist[vertex]
+            if key > cost + tree_dist[index[vertex]]:
+                continue
+            if vertex == end:
+                break
+            for neighbour in self.__dict_out[vertex]:
+                if neighbour in removed_vertices or (vertex, neighbour) in removed_edges or \
+                        tree_dist[index[neighbour]] == INFINITY:
+                    continue
+                new_cost = cost + cost_of[(vertex, neighbour)]
+                if new_cost < dist.get(neighbour, INFINITY):
+                    dist[neighbour] = new_cost
+                    prev[neighbour] = vertex
+                    heapq.heappush(heap, (new_cost + tree_dist[index[neighbour]], neighbour))
+        if end not in dist:
+            return None
+        walk = []
+        current = end
+        while current is not None:
+            walk.append(current)
+            current = prev[current]
+        return walk[::-1], dist[end]
+
+    def build_contraction_hierarchy(self):
+        """
+        Builds a contraction hierarchy of the graph (see ContractionHierarchy), which answers minimum cost walk
+        queries (ContractionHierarchy.find_walk) for as long as the graph does not change.
+        :return: An instance of ContractionHierarchy
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        return ContractionHierarchy(self)
+
+    def shortest_path_tree(self, root, direction="in", cache=True):
+        """
+        Computes the minimum cost walks between the vertex <root> and all the other vertices using Dijkstra's
+        Algorithm. The last TREE_CACHE_SIZE trees are cached (for the current version of the graph), so asking for
+        the same tree again, or asking reverse_dijkstra (which builds and caches the "in" trees) for another walk
+        to the root of a cached "in" tree, does not search the graph again.
+        :param root: The root of the tree; int
+        :param direction: "in" - the walks from every vertex to <root>; "out" - the walks from <root> to every vertex
+        :param cache: False - the tree is neither read from nor stored in the cache (for trees used only once)
+        :return: An instance of ShortestPathTree
+        :raise: GraphException - if the vertex is not in the graph or the direction is not "in" or "out"
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        if not self.is_vertex_in_graph(root):
+            raise GraphException(f"ERROR: Vertex {root} is not in the graph.")
+        if direction not in ("in", "out"):
+            raise GraphException(f"ERROR: Unknown direction {direction}; expected 'in' or 'out'.")
+        if self.has_negative_costs():
+            raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
+        tree = self.__get_cached_tree(root, direction) if cache else None
+        if tree is not None:
+            return tree
+        dist, prev = self.__dijkstra(root, backward=direction == "in")
+        vertices = list(dist)
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        parent = [-1 if prev[vertex] is None else index[prev[vertex]] for vertex in vertices]
+        tree = ShortestPathTree(root, direction, vertices, list(dist.values()), parent)
+        if not cache:
+            return tree
+        self.__tree_cache[(root, direction, self.__version)] = tree
+        if len(self.__tree_cache) > TREE_CACHE_SIZE:
+            self.__tree_cache.popitem(last=False)
+        return tree
+
+    def min_cost_walks(self, pairs, workers=None):
+        """
+        Finds the minimum cost walks for many (start, end) pairs at once. The pairs are grouped by their ending
+        vertex (one backward search, like reverse_dijkstra) or by their starting vertex (one forward search),
+        whichever is shared by more pairs, and every search stops as soon as the walks of all the pairs of its
+        group are known. With <workers> given, the groups are split between that many worker processes.
+        :param pairs: The (start, end) pairs; list
+        :param workers: The number of worker processes; None to do everything in the current process
+        :return: The minimum cost walk of every pair as a list (the same format as reverse_dijkstra) or None if the
+        end is not accessible from the start; list, in the order of <pairs>
+        :raise: GraphException - if one of the given vertices is not in the graph
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        pairs = list(pairs)
+        for start, end in pairs:
+            if not self.is_vertex_in_graph(start):
+                raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
+            if not self.is_vertex_in_graph(end):
+                raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
+        if self.has_negative_costs():
+            raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
+        no_starts, no_ends = {}, {}
+        for start, end in pairs:
+            no_starts[start] = no_starts.get(start, 0) + 1
+            no_ends[end] = no_ends.get(end, 0) + 1
+        # (root, direction) -> the positions (in <pairs>) of the pairs of the group
+        groups = {}
+        for position, (start, end) in enumerate(pairs):
+            key = (end, "in") if no_ends[end] >= no_starts[start] else (start, "out")
+            groups.setdefault(key, []).append(position)
+        tasks = [(root, direction, [pairs[position] for position in positions])
+                 for (root, direction), positions in groups.items()]
+        if workers is None:
+            results = [self.__group_walks(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_set_worker_graph,
+                                     initargs=(self,)) as executor:
+                results = list(executor.map(_group_walks, [task_pairs for _, _, task_pairs in tasks],
+                                            chunksize=max(1, len(tasks) // (4 * workers))))
+        walks = [None] * len(pairs)
+        for positions, group_result in zip(groups.values(), results):
+            for position, walk in zip(positions, group_result):
+                walks[position] = walk
+        return walks
+
+    def __group_walks(self, root, direction, pairs):
+        """
+        Finds the minimum cost walks of a group of pairs which share the ending vertex (direction "in") or the
+        starting vertex (direction "out") <root>, with a single search (a task of min_cost_walks).
+        :return: The minimum cost walk (or None) of every pair; list
+        """
+        backward = direction == "in"
+        others = [start if backward else end for start, end in pairs]
+        dist, prev = self.__dijkstra(root, backward=backward, targets=others)
+        walks = []
+        for other in others:
+            if dist[other] == INFINITY:
+                walks.append(None)
+                continue
+            walk = []
+            current = other
+            while current is not None:
+                walk.append(current)
+                current = prev[current]
+            walks.append(walk if backward else walk[::-1])
+        return walks
+
+    def maintain_shortest_path_tree(self, root, direction="in"):
+        """
+        Creates a shortest path tree which is kept up to date as the graph changes (see DynamicShortestPathTree),
+        instead of being computed again after every change. reverse_dijkstra uses the maintained "in" trees.
+        :param root: The root of the tree; int
+        :param direction: "in" - the walks from every vertex to <root>; "out" - the walks from <root> to every vertex
+        :return: An instance of DynamicShortestPathTree (the same one if the tree is already maintained)
+        :raise: GraphException - if the vertex is not in the graph or the direction is not "in" or "out"
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        if (root, direction) in self.__maintained_trees:
+            return self.__maintained_trees[(root, direction)]
+        tree = DynamicShortestPathTree(self, root, direction)
+        self.add_listener(tree)
+        self.__maintained_trees[(root, direction)] = tree
+        return tree
+
+    def stop_maintaining_shortest_path_tree(self, root, direction="in"):
+        """
+        Stops keeping the given shortest path tree up to date (see maintain_shortest_path_tree).
+        :raise: GraphException - if the tree is not maintained
+        """
+        if (root, direction) not in self.__maintained_trees:
+            raise GraphException(f"ERROR: The {direction} tree of vertex {root} is not maintained.")
+        self.remove_listener(self.__maintained_trees.pop((root, direction)))
+
+    def __get_cached_tree(self, root, direction):
+        """
+        Returns the cached shortest path tree with the given root and direction for the current version of the
+        graph, or None if there is no such tree. The trees of the older versions are dropped.
+        """
+        if self.__tree_cache and next(iter(self.__tree_cache))[2] != self.__version:
+            self.__tree_cache = OrderedDict((key, tree) for key, tree in self.__tree_cache.items()
+                                            if key[2] == self.__version)
+        key = (root, direction, self.__version)
+        if key not in self.__tree_cache:
+            return None
+        self.__tree_cache.move_to_end(key)
+        return self.__tree_cache[key]
+
+    def __dijkstra(self, source, backward=False, targets=None):
+        """
+        The Dijkstra engine shared by all the minimum cost walk functions. It uses a plain binary heap (heapq, no
+        locking, unlike queue.PriorityQueue) and reads the costs of the edges directly from the cost dictionary.
+        :param source: The vertex where the search starts; int
+        :param backward: False - the search follows the edges forward (the walks start in <source>); True - the
+        search follows the edges backwards (the walks end in <source>)
+        :param targets: If given, the search stops as soon as the minimum cost walks to these vertices are known
+        :return: 2 dictionaries: dist - the cost of the minimum cost walk between <source> and every vertex (or
+        INFINITY if there is no such walk) and prev - the vertex before every vertex on its minimum cost walk from
+        <source> (for a forward search) or the vertex after it on its minimum cost walk to <source> (for a backward
+        search); None for <source> and for the vertices that were not reached
+        """
+        if self.has_integer_costs() and self.get_max_cost() is not None and self.get_max_cost() <= DIAL_MAX_COST:
+            return self.__dial(source, backward, targets)
+        adjacency = self.__dict_in if backward else self.__dict_out
+        cost_of = self.__cost
+        dist = dict.fromkeys(adjacency, INFINITY)
+        prev = dict.fromkeys(adjacency)
+        dist[source] = 0
+        pending = set(targets) if targets is not None else None
+        heap = [(0, source)]
+        while heap:
+            cost, vertex = heapq.heappop(heap)
+            if cost > dist[vertex]:
+                # If we already have a walk smaller than what we have to currently process, then skip this step
+                continue
+            if pending and vertex in pending:
+                pending.remove(vertex)
+                if not pending:
+                    break
+            for neighbour in adjacency[vertex]:
+                new_cost = cost + (cost_of[(neighbour, vertex)] if backward else cost_of[(vertex, neighbour)])
+                if new_cost < dist[neighbour]:
+                    dist[neighbour] = new_cost
+                    prev[neighbour] = vertex
+                    heapq.heappush(heap, (new_cost, neighbour))
+        return dist, prev
+
+    def __dial(self, source, backward=False, targets=None):
+        """
+        Dial's algorithm: Dijkstra's Algorithm with a bucket queue (see BucketQueue) instead of a binary heap, used
+        by __dijkstra when all the costs are small non-negative integers. The vertices are processed in the same
+        order as with the binary heap, so the results are identical.
+        :return: The dictionaries dist and prev; see __dijkstra
+        """
+        adjacency = self.__dict_in if backward else self.__dict_out
+        cost_of = self.__cost
+        dist = dict.fromkeys(adjacency, INFINITY)
+        prev = dict.fromkeys(adjacency)
+        dist[source] = 0
+        pending = set(targets) if targets is not None else None
+        queue = BucketQueue(int(self.get_max_cost()))
+        queue.push(0, source)
+        while queue:
+            cost, vertex = queue.pop()
+            if cost > dist[vertex]:
+                continue
+            if pending and vertex in pending:
+                pending.remove(vertex)
+                if not pending:
+                    break
+            for neighbour in adjacency[vertex]:
+                new_cost = cost + (cost_of[(neighbour, vertex)] if backward else cost_of[(vertex, neighbour)])
+                if new_cost < dist[neighbour]:
+                    dist[neighbour] = new_cost
+                    prev[neighbour] = vertex
+                    queue.push(new_cost, neighbour)
+        return dist, prev
+
+    def delta_stepping(self, root, direction="out", delta=None):
+        """
+        Computes the costs of the minimum cost walks between the vertex <root> and all the other vertices with the
+        delta-stepping algorithm, meant for very large graphs. The vertices are kept in buckets of width <delta> by
+        their current cost and the buckets are settled in increasing order. The edges are split into light ones
+        (cost at most <delta>), which may put a vertex back into the bucket being settled and are relaxed again
+        until the bucket does not change, and heavy ones, which are relaxed once for every vertex of the settled
+        bucket. Every relaxation phase is done for the whole bucket at once, over numpy arrays.
+        :param root: The root; int
+        :param direction: "out" - the walks from <root> to every vertex; "in" - the walks from every vertex to <root>
+        (the costs computed by reverse_dijkstra)
+        :param delta: The width of the buckets; None to pick it from the cost statistics (the largest cost divided
+        by the average degree)
+        :return: The cost of the minimum cost walk between <root> and every vertex (INFINITY if there is none), in
+        the order of get_all_vertices; list (the same as shortest_path_tree(root, direction).dist)
+        :raise: GraphException - if the vertex is not in the graph or the direction is not "in" or "out"
+        :raise: GraphException - if the graph has negative cost edges
+        """
+        if not self.is_vertex_in_graph(root):
+            raise GraphException(f"ERROR: Vertex {root} is not in the graph.")
+        if direction not in ("in", "out"):
+            raise GraphException(f"ERROR: Unknown direction {direction}; expected 'in' or 'out'.")
+        if self.has_negative_costs():
+            raise GraphException("ERROR: Cannot apply Dijkstra's Algorithms. The graph has negative edges.")
+        vertices, sources, targets, costs = self.get_edge_arrays()
+        if direction == "in":
+            sources, targets = targets, sources
+        n = len(vertices)
+        if delta is None:
+            max_cost = self.get_max_cost() or 0
+            delta = max(max_cost * n / max(len(costs), 1), 1 if self.has_integer_costs() else 0) or 1
+        # The light and the heavy edges as 2 compressed sparse rows structures (sorted by the tree direction source)
+        csr = []
+        for kind in (costs <= delta, costs > delta):
+            order = numpy.argsort(sources[kind], kind="stable")
+            offsets = numpy.zeros(n + 1, dtype=numpy.int64)
+            numpy.cumsum(numpy.bincount(sources[kind], minlength=n), out=offsets[1:])
+            csr.append((offsets, targets[kind][order], costs[kind][order]))
+        dist = numpy.full(n, numpy.inf)
+        settled = numpy.zeros(n, dtype=bool)
+        dist[vertices.index(root)] = 0
+        while True:
+            waiting = numpy.flatnonzero(~settled & (dist < numpy.inf))
+            if not len(waiting):
+                break
+            bucket = numpy.floor(dist[waiting].min() / delta)
+            frontier = waiting[numpy.floor(dist[waiting] / delta) == bucket]
+            removed = [frontier]
+            while len(frontier):
+                improved = self.__relax_edges(dist, frontier, *csr[0])
+                frontier = improved[numpy.floor(dist[improved] / delta) == bucket]
+                removed.append(frontier)
+            removed = numpy.unique(numpy.concatenate(removed))
+            self.__relax_edges(dist, removed, *csr[1])
+            settled[removed] = True
+        integer = self.has_integer_costs()
+        return [INFINITY if cost == numpy.inf else int(cost) if integer else float(cost) for cost in dist]
+
+    @staticmethod
+    def __relax_edges(dist, frontier, offsets, targets, costs):
+        """
+        Relaxes all the edges (given as a compressed sparse rows structure) leaving the vertices of the frontier.
+        :return: The vertices whose cost decreased; numpy array
+        """
+        starts, counts = offsets[frontier], offsets[frontier + 1] - offsets[frontier]
+        total = counts.sum()
+        if total == 0:
+            return numpy.empty(0, dtype=numpy.int64)
+        # The positions of the edges: starts[i], starts[i] + 1, ..., starts[i] + counts[i] - 1 for every vertex i
+        positions = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts) + numpy.arange(total)
+        reached = targets[positions]
+        candidates = numpy.repeat(dist[frontier], counts) + costs[positions]
+        better = candidates < dist[reached]
+        reached, candidates = reached[better], candidates[better]
+        numpy.minimum.at(dist, reached, candidates)
+        return numpy.unique(reached)
+
+    def get_edge_arrays(self):
+        """
+        Returns the edges of the graph as numpy arrays, for the vectorized algorithms. The arrays are built in
+        O(V + E) once for every version of the graph and they must not be modified.
+        :return: A tuple (vertices, sources, targets, costs): vertices - the list of the vertices of the graph;
+        sources, targets - numpy arrays with the positions (in <vertices>) of the ends of every edge; costs - numpy
+        array (of floats) with the cost of every edge
+        """
+        if self.__edge_arrays_version != self.__version:
+            vertices = list(self.__dict_out)
+            index = {vertex: i for i, vertex in enumerate(vertices)}
+            no_edges = len(self.__cost)
+            sources = numpy.fromiter((index[_from] for _from, _ in self.__cost), dtype=numpy.int64, count=no_edges)
+            targets = numpy.fromiter((index[_to] for _, _to in self.__cost), dtype=numpy.int64, count=no_edges)
+            costs = numpy.fromiter(self.__cost.values(), dtype=numpy.float64, count=no_edges)
+            self.__edge_arrays = (vertices, sources, targets, costs)
+            self.__edge_arrays_version = self.__version
+        return self.__edge_arrays
+
+    def __vectorized_bellman_ford(self, source):
+        """
+        Edge-parallel Bellman-Ford over the edge arrays: every round relaxes all the edges at once, with
+        numpy.minimum.at(dist, targets, dist[sources] + costs). The rounds stop as soon as nothing changes; if the
+        costs still change in the n-th round, a negative cost cycle is accessible from <source>.
+        :param source: The vertex where the search starts; int
+        :return: A tuple (vertices, dist, prev, negative_cycle): dist - numpy array with the cost of the minimum cost
+        walk to every vertex of <vertices> (inf if there is none); prev - numpy array with the position of the
+        previous vertex on that walk (-1 for none); negative_cycle - True if there is a negative cost cycle
+        accessible from <source> (dist and prev are then meaningless)
+        """
+        vertices, sources, targets, costs = self.get_edge_arrays()
+        no_vertices = len(vertices)
+        dist = numpy.full(no_vertices, numpy.inf)
+        prev = numpy.full(no_vertices, -1, dtype=numpy.int64)
+        dist[vertices.index(source)] = 0
+        for _ in range(no_vertices):
+            candidates = dist[sources] + costs
+            new_dist = dist.copy()
+            numpy.minimum.at(new_dist, targets, candidates)
+            changed = new_dist < dist
+            if not changed.any():
+                return vertices, dist, prev, False
+            # Every vertex whose cost decreased takes as previous vertex the start of an edge giving its new cost
+            improving = changed[targets] & (candidates == new_dist[targets])
+            prev[targets[improving]] = sources[improving]
+            dist = new_dist
+        return vertices, dist, prev, True
+
+    def __bellman_ford(self, source=None):
+        """
+        The queue-based Bellman-Ford engine (SPFA) shared by the functions which accept negative cost edges. Only
+        the outbound edges of the vertices whose cost just decreased are relaxed again. For every vertex we keep
+        the number of edges of its current walk from <source>: a walk of at least n edges repeats a vertex, so
+        a negative cost cycle is reachable, and it is then looked up on the chain of previous vertices.
+        :param source: The vertex where the search starts; int or None for a virtual vertex with a zero cost edge
+        to every vertex of the graph (the costs are then Johnson's potentials, see all_pairs_shortest_paths)
+        :return: A tuple (dist, prev, cycle): dist and prev are as for __dijkstra; cycle is None if there is no
+        negative cost cycle accessible from <source>, otherwise it is such a cycle as a closed walk (the first
+        and the last vertex are the same) and dist, prev are meaningless
+        """
+        adjacency = self.__dict_out
+        cost_of = self.__cost
+        no_vertices = len(adjacency)
+        dist = dict.fromkeys(adjacency, INFINITY)
+        prev = dict.fromkeys(adjacency)
+        length = dict.fromkeys(adjacency, 0)
+        in_queue = dict.fromkeys(adjacency, False)
+        sources = list(adjacency) if source is None else [source]
+        for vertex in sources:
+            dist[vertex] = 0
+            in_queue[vertex] = True
+        queue = deque(sources)
+        while queue:
+            vertex = queue.popleft()
+            in_queue[vertex] = False
+            cost = dist[vertex]
+            for neighbour in adjacency[vertex]:
+                new_cost = cost + cost_of[(vertex, neighbour)]
+                if new_cost < dist[neighbour]:
+                    dist[neighbour] = new_cost
+                    prev[neighbour] = vertex
+                    length[neighbour] = length[vertex] + 1
+                    if length[neighbour] % no_vertices == 0:
+                        cycle = self.__find_cycle_of_previous(prev, neighbour)
+                        if cycle is not None:
+                            return dist, prev, cycle
+                    if not in_queue[neighbour]:
+                        queue.append(neighbour)
+                        in_queue[neighbour] = True
+        return dist, prev, None
+
+    @staticmethod
+    def __find_cycle_of_previous(prev, vertex):
+        """
+        Follows the chain of previous vertices starting from <vertex>. If the chain runs into a cycle (which, for
+        a chain built by relaxing edges, has a negative cost), returns the cycle as a closed walk; otherwise None.
+        """
+        position = {}
+        chain = []
+        while vertex is not None and vertex not in position:
+            position[vertex] = len(chain)
+            chain.append(vertex)
+            vertex = prev[vertex]
+        if vertex is None:
+            return None
+        cycle = chain[position[vertex]:] + [vertex]
+        return cycle[::-1]
+
+    def find_negative_cost_cycle(self, start):
+        """
+        Finds a negative cost cycle accessible from the given vertex <start>.
+        :param start: The starting vertex; int
+        :return: A negative cost cycle as a closed walk (the first and the last vertex are the same) or None if no
+        negative cost cycle is accessible from vertex <start>
+        :raise: GraphException - if the given starting vertex is not in the graph
+        """
+        if not self.is_vertex_in_graph(start):
+            raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
+        if not self.has_negative_costs():
+            return None
+        return self.__bellman_ford(start)[2]
+
+    def exist_negative_cost_cycles(self, start, engine="python"):
         """
         Checks if the graph has a negative cost cycles using the Bellman-Ford algorithm starting from the given
         vertex <start>
         :param start: The starting vertex; int
+        :param engine: "python" - the queue based Bellman-Ford; "vectorized" - the edge-parallel Bellman-Ford over
+        numpy arrays, meant for very large graphs. Both engines give the same results.
         :return: True - if the graph has negative cost cycles when considering a Bellman-Ford Algorithm starting
         from vertex <start>; False otherwise
         :raise: GraphException - if the given starting vertex is not in the graph
+        :raise: GraphException - if the given engine is unknown
         """
         if not self.is_vertex_in_graph(start):
             raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
-        dist = {node: INFINITY for node in self.get_all_vertices()}
-        dist[start] = 0
-        for _ in range(self.get_no_vertices()):
-            for _from, _to, _cost in self.get_all_edges():
-                if dist[_from] != INFINITY and dist[_from] + _cost < dist[_to]:
-                    dist[_to] = dist[_from] + _cost
-        for _from, _to, _cost in self.get_all_edges():
-            if dist[_from] != INFINITY and dist[_from] + _cost < dist[_to]:
-                return True
-        return False
+        if engine == "vectorized":
+            return self.has_negative_costs() and self.__vectorized_bellman_ford(start)[3]
+        if engine != "python":
+            raise GraphException(f"ERROR: Unknown Bellman-Ford engine {engine}; expected 'python' or 'vectorized'.")
+        return self.find_negative_cost_cycle(start) is not None
 
-    def count_walks_of_minimum_cost(self, start, end):
+    def count_walks_of_minimum_cost(self, start, end, modulo=None):
         """
-        Counts the number of distinct minimum cost walks from vertex <start> to vertex <end> using a modified
-        Bellman-Ford algorithm.
+        Counts the number of distinct minimum cost walks from vertex <start> to vertex <end>. The costs of the
+        minimum cost walks from <start> are found with the Bellman-Ford engine; the edges on minimum cost walks
+        (dist[_from] + cost == dist[_to]) form a DAG, and the walks are counted over it in topological order.
         :param start: The starting vertex; int
         :param end: The ending vertex; int
+        :param modulo: If given, the count is computed modulo this number (for astronomically large counts); int
         :return: The number of distinct minimum cost walks between vertex <start> and vertex <end>
         :raise: GraphException - if one of the given vertices is not in the graph
         :raise: GraphException - if the graph has negative cost cycles
         :raise: GraphException - if the vertex <end> is not accessible from the vertex <start>
+        :raise: GraphException - if there are infinitely many minimum cost walks (a zero cost cycle is on them)
         """
         if not self.is_vertex_in_graph(start):
             raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
         if not self.is_vertex_in_graph(end):
             raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
-        if self.exist_negative_cost_cycles(start):
+        dist, _, cycle = self.__bellman_ford(start)
+        if cycle is not None:
             raise GraphException("ERROR: The graph has negative cost cycles. Bellman Fold Algorithm cannot be used.")
-        dist = {node: INFINITY for node in self.get_all_vertices()}
-        saved_walks = {node: [] for node in self.get_all_vertices()}
-        saved_walks[start].append([start])
-        # saved_walks(vertex) - all the walks of minimum cost from <start> to <vertex>
-        dist[start] = 0
-        changed = True
-        while changed:
-            changed = False
-            for _from, _to, _cost in self.get_all_edges():
-                if dist[_from] + _cost < dist[_to]:
-                    dist[_to] = dist[_from] + _cost
-                    saved_walks[_to] = [walk + [_to] for walk in saved_walks[_from]]
-                    changed = True
-                elif dist[_from] + _cost == dist[_to]:
-                    for walk in saved_walks[_from]:
-                        if walk + [_to] not in saved_walks[_to]:
-                            saved_walks[_to].append(walk + [_to])
         if dist[end] == INFINITY:
             raise GraphException(f"ERROR: The vertex {end} is NOT accessible from vertex {start}.")
-        return len(saved_walks[end])
+        cost_of = self.__cost
+        # The DAG of the edges on minimum cost walks from <start>, sorted topologically with Kahn's algorithm
+        tight_in_degree = {vertex: 0 for vertex in dist if dist[vertex] != INFINITY}
+        for vertex in tight_in_degree:
+            for neighbour in self.__dict_out[vertex]:
+                if dist[vertex] + cost_of[(vertex, neighbour)] == dist[neighbour]:
+                    tight_in_degree[neighbour] += 1
+        # no_walks(vertex) - the number of minimum cost walks from <start> to <vertex>
+        no_walks = dict.fromkeys(tight_in_degree, 0)
+        no_walks[start] = 1
+        queue = deque(vertex for vertex, degree in tight_in_degree.items() if degree == 0)
+        while queue:
+            vertex = queue.popleft()
+            if vertex == end:
+                return no_walks[end]
+            for neighbour in self.__dict_out[vertex]:
+                if dist[vertex] + cost_of[(vertex, neighbour)] == dist[neighbour]:
+                    no_walks[neighbour] += no_walks[vertex]
+                    if modulo is not None:
+                        no_walks[neighbour] %= modulo
+                    tight_in_degree[neighbour] -= 1
+                    if tight_in_degree[neighbour] == 0:
+                        queue.append(neighbour)
+        # <end> is never reached in topological order only if a zero cost cycle leads to it
+        raise GraphException(f"ERROR: There are infinitely many minimum cost walks from vertex {start} to vertex "
+                             f"{end} (they can go around a zero cost cycle).")
 
-    def bellman(self, start, end):
+    def bellman(self, start, end, engine="python"):
         """
         Finds the minimum cost walk between vertex <start> and vertex <end>. Unlike Dijkstra's algorithm, this
         algorithm accepts graphs with negative cost edges (although it doesn't accept graphs with negative
         cost CYCLES).
         :param start: The starting vertex; int
         :param end: The ending vertex; int
+        :param engine: "python" - the queue based Bellman-Ford; "vectorized" - the edge-parallel Bellman-Ford over
+        numpy arrays, meant for very large graphs. Both engines find walks of the same cost.
         :return: The minimum cost walk from <start> to <end> as a list
         :raise: GraphException - if one of the given vertices is not in the graph
-        :raise: GraphException - if the graph has negative cost cycles
+        :raise: GraphException - if the graph has negative cost cycles (the message shows one of the cycles)
         :raise: GraphException - if the vertex <end> is not accessible from the vertex <start>
+        :raise: GraphException - if the given engine is unknown
         """
         if not self.is_vertex_in_graph(start):
             raise GraphException(f"ERROR: Vertex {start} is not in the graph.")
         if not self.is_vertex_in_graph(end):
             raise GraphException(f"ERROR: Vertex {end} is not in the graph.")
-        if self.exist_negative_cost_cycles(start):
-            raise GraphException("ERROR: The graph has negative cost cycles. Bellman Fold Algorithm cannot be used.")
-        dist = {node: INFINITY for node in self.get_all_vertices()}
-        prev = {node: None for node in self.get_all_vertices()}
-        dist[start] = 0
-        changed = True
-        while changed:
-            changed = False
-            for _from, _to, _cost in self.get_all_edges():
-                if dist[_from] + _cost < dist[_to]:
-                    dist[_to] = dist[_from] + _cost
-                    prev[_to] = _from
-                    changed = True
+        if engine == "vectorized":
+            return self.__vectorized_bellman(start, end)
+        if engine != "python":
+            raise GraphException(f"ERROR: Unknown Bellman-Ford engine {engine}; expected 'python' or 'vectorized'.")
+        dist, prev, cycle = self.__bellman_ford(start)
+        if cycle is not None:
+            raise GraphException("ERROR: The graph has negative cost cycles (" + " -> ".join(map(str, cycle)) +
+                                 "). Bellman Fold Algorithm cannot be used.")
         if dist[end] == INFINITY:
             raise GraphException(f"ERROR: The vertex {end} is NOT accessible from vertex {start}.")
         walk = []
@@ -400,6 +1812,126 @@ class TripleDictGraph:
             current = prev[current]
         return walk[::-1]
 
+    def __vectorized_bellman(self, start, end):
+        """
+        The vectorized engine of bellman (see __vectorized_bellman_ford).
+        """
+        vertices, dist, prev, negative_cycle = self.__vectorized_bellman_ford(start)
+        if negative_cycle:
+            raise GraphException("ERROR: The graph has negative cost cycles. Bellman Fold Algorithm cannot be used.")
+        current = vertices.index(end)
+        if dist[current] == numpy.inf:
+            raise GraphException(f"ERROR: The vertex {end} is NOT accessible from vertex {start}.")
+        walk = []
+        while current != -1:
+            walk.append(vertices[current])
+            current = prev[current]
+        return walk[::-1]
+
+    def all_pairs_shortest_paths(self, file_name=None, workers=None):
+        """
+        Computes the costs of the minimum cost walks between all the pairs of vertices with Johnson's algorithm,
+        which accepts negative cost edges: one Bellman-Ford search from a virtual vertex gives every vertex a
+        potential h (the cost of its minimum cost walk from the virtual vertex), the edges are reweighted to
+        cost + h[_from] - h[_to] (which is never negative) and a Dijkstra search is run from every vertex. The
+        results are written in a memory-mapped .npy file: with <workers> given, the Dijkstra searches are split
+        between that many worker processes, which write their rows directly in the file (so the matrix is never
+        sent between processes).
+        :param file_name: The name of the .npy file where the matrix is written; None for a new temporary file, which
+        is owned by the caller (its name is the filename attribute of the result) and must be removed by them
+        :param workers: The number of worker processes; None to do everything in the current process
+        :return: A memory-mapped numpy matrix (n x n, of floats) with the cost of the minimum cost walk between
+        every 2 vertices or inf if there is none; the rows and the columns follow the order of get_all_vertices
+        :raise: GraphException - if the graph has negative cost cycles
+        """
+        vertices = list(self.get_all_vertices())
+        if self.has_negative_costs():
+            potential, _, cycle = self.__bellman_ford()
+            if cycle is not None:
+                raise GraphException("ERROR: The graph has negative cost cycles. Johnson's Algorithm cannot be used.")
+        else:
+            potential = dict.fromkeys(vertices, 0)
+        reweighted = TripleDictGraph()
+        for vertex in vertices:
+            reweighted.add_vertex(vertex)
+        for (_from, _to), cost in self.__cost.items():
+            # max guards against rounding errors of non-integer costs
+            reweighted.add_edge(_from, _to, max(cost + potential[_from] - potential[_to], 0))
+        if file_name is None:
+            descriptor, file_name = tempfile.mkstemp(suffix=".npy")
+            os.close(descriptor)
+        matrix = numpy.lib.format.open_memmap(file_name, mode="w+", dtype=numpy.float64,
+                                              shape=(len(vertices), len(vertices)))
+        del matrix
+        potentials = numpy.array([potential[vertex] for vertex in vertices], dtype=numpy.float64)
+        rows = range(len(vertices))
+        if workers is None:
+            _set_worker_graph(reweighted, (file_name, potentials))
+            try:
+                for row in rows:
+                    _johnson_row(row)
+            finally:
+                _worker_graph.clear()
+        else:
+            # The reweighted graph is sent once to every worker, not once for every row
+            with ProcessPoolExecutor(max_workers=workers, initializer=_set_worker_graph,
+                                     initargs=(reweighted, (file_name, potentials))) as executor:
+                list(executor.map(_johnson_row, rows, chunksize=max(1, len(vertices) // (4 * workers))))
+        return numpy.load(file_name, mmap_mode="r+")
+
+    def floyd_warshall(self, block_size=FLOYD_WARSHALL_BLOCK):
+        """
+        Computes the minimum cost walks between all the pairs of vertices with a blocked Floyd-Warshall algorithm
+        over a dense cost matrix (inf for the missing edges), meant for small dense graphs. The intermediate
+        vertices are processed <block_size> at a time: first the rows and the columns of the block are updated,
+        then the rest of the matrix is updated through the whole block a few rows at a time, so those rows are read
+        from the cache for every vertex of the block. Every update is a vectorized min-plus step (numpy
+        broadcasting). Negative cost edges are accepted.
+        :param block_size: The number of intermediate vertices processed together; int
+        :return: An instance of AllPairsWalks
+        :raise: GraphException - if the graph has negative cost cycles (a negative entry on the diagonal)
+        """
+        vertices = list(self.get_all_vertices())
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        n = len(vertices)
+        dist = numpy.full((n, n), numpy.inf)
+        next_hop = numpy.full((n, n), -1, dtype=numpy.int64)
+        numpy.fill_diagonal(dist, 0)
+        numpy.fill_diagonal(next_hop, numpy.arange(n))
+        for (_from, _to), cost in self.__cost.items():
+            i, j = index[_from], index[_to]
+            if cost < dist[i, j]:
+                dist[i, j] = cost
+                next_hop[i, j] = j
+        for block_start in range(0, n, block_size):
+            block = range(block_start, min(block_start + block_size, n))
+            # The rows and the columns of the block, one intermediate vertex at a time
+            inside, everywhere = slice(block.start, block.stop), slice(0, n)
+            for k in block:
+                self.__relax_through(dist, next_hop, k, inside, everywhere)
+                self.__relax_through(dist, next_hop, k, everywhere, inside)
+            # Everything else, a few rows at a time (so that they stay in the cache while the whole block is used)
+            chunk_rows = max(1, FLOYD_WARSHALL_CHUNK // n)
+            for row_start in range(0, n, chunk_rows):
+                chunk = slice(row_start, min(row_start + chunk_rows, n))
+                for k in block:
+                    self.__relax_through(dist, next_hop, k, chunk, everywhere)
+        if (numpy.diagonal(dist) < 0).any():
+            raise GraphException("ERROR: The graph has negative cost cycles. Floyd-Warshall Algorithm cannot be used.")
+        return AllPairsWalks(vertices, dist, next_hop)
+
+    @staticmethod
+    def __relax_through(dist, next_hop, k, rows, columns):
+        """
+        A Floyd-Warshall step on a part of the matrices: every walk between the given rows and columns (slices) is
+        replaced by the walk through the vertex with the index k if the latter is cheaper.
+        """
+        part = dist[rows, columns]
+        candidates = dist[rows, k, None] + dist[k, columns]
+        better = candidates < part
+        numpy.copyto(part, candidates, where=better)
+        numpy.copyto(next_hop[rows, columns], next_hop[rows, k, None].copy(), where=better)
+
     def calculate_walk_cost(self, walk):
         """
         Calculates the cost of traversing the graph on the given walk.
@@ -429,6 +1961,72 @@ class TripleDictGraph:
         return graph_drawing
 
 
+def is_integer_cost(cost):
+    """
+    Checks if the given edge cost is an integer (an int or a float without a fractional part).
+    """
+    return isinstance(cost, int) or isinstance(cost, float) and cost.is_integer()
+
+
+# The graph (and the other shared data) of a worker process
+_worker_graph = {}
+
+
+def _set_worker_graph(graph, matrix=None):
+    """
+    Initializes a worker process of TripleDictGraph.build_landmark_index or TripleDictGraph.all_pairs_shortest_paths
+    with its copy of the graph and, for the latter, the name of the result file and the potentials of the vertices.
+    """
+    _worker_graph["graph"] = graph
+    if matrix is not None:
+        file_name, potentials = matrix
+        _worker_graph["matrix"] = numpy.load(file_name, mmap_mode="r+")
+        _worker_graph["potentials"] = potentials
+        _worker_graph["vertices"] = list(graph.get_all_vertices())
+
+
+def _landmark_costs(landmark):
+    """
+    Computes the costs of the minimum cost walks from the given landmark to every vertex and from every vertex to
+    the landmark (a task of TripleDictGraph.build_landmark_index, possibly run by a worker process). The trees are
+    used only once, so they are not kept in the tree cache of the graph.
+    :return: A pair of lists (from the landmark, to the landmark), in the order of graph.get_all_vertices
+    """
+    graph = _worker_graph["graph"]
+    return (graph.shortest_path_tree(landmark, "out", cache=False).dist,
+            graph.shortest_path_tree(landmark, "in", cache=False).dist)
+
+
+def _johnson_row(row):
+    """
+    Computes the row of the given vertex (its position in graph.get_all_vertices) of the matrix of
+    TripleDictGraph.all_pairs_shortest_paths with a Dijkstra search over the reweighted graph, removes the
+    reweighting and writes the row in the memory-mapped matrix (a task possibly run by a worker process).
+    """
+    graph, matrix, potentials = _worker_graph["graph"], _worker_graph["matrix"], _worker_graph["potentials"]
+    tree = graph.shortest_path_tree(_worker_graph["vertices"][row], "out", cache=False)
+    dist = numpy.array(tree.dist, dtype=numpy.float64)
+    dist[dist == INFINITY] = numpy.inf
+    # The matrix is a shared mapping of the file, so the row is seen by the other processes without flushing it
+    matrix[row] = dist - potentials[row] + potentials
+
+
+def _group_walks(pairs):
+    """
+    Finds the minimum cost walks of a group of pairs of TripleDictGraph.min_cost_walks (a task run by a worker
+    process). The pairs of a group share their ending or their starting vertex, so min_cost_walks finds them with a
+    single search in the worker too.
+    """
+    return _worker_graph["graph"].min_cost_walks(pairs)
+
+
+def landmark_index_file_name(graph_file_name):
+    """
+    Returns the name of the file where the landmark index of the graph stored in the given file is kept.
+    """
+    return graph_file_name + ".alt"
+
+
 def read_graph(file_name):
     """
     Reads a graph from a given file, builds this graph and returns it.
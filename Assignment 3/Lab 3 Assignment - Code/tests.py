@@ -1,9 +1,58 @@
+import math
+import os
+import random
+import tempfile
 import unittest
 
-from directed_graph import read_graph, create_random_graph, write_graph, TripleDictGraph
+from directed_graph import read_graph, create_random_graph, write_graph, TripleDictGraph, LandmarkIndex, \
+    landmark_index_file_name, BucketQueue, INFINITY, DIAL_MAX_COST, MAX_GRAPH_COST
 from errors import GraphException
 
 
+def build_small_graph(no_vertices=6):
+    """
+    Builds the small graph shared by the minimum cost walk tests: vertices 0, 1, ..., <no_vertices> - 1 (the ones
+    after 5 are isolated) and 9 edges with non-negative costs; the minimum cost walk from 0 to 5 is [0, 1, 3, 4, 5],
+    of cost 10.
+    """
+    g = TripleDictGraph()
+    for vertex in range(no_vertices):
+        g.add_vertex(vertex)
+    g.add_edge(0, 1, 3)
+    g.add_edge(0, 2, 4)
+    g.add_edge(1, 2, 6)
+    g.add_edge(1, 3, 2)
+    g.add_edge(1, 4, 7)
+    g.add_edge(2, 4, 5)
+    g.add_edge(3, 4, 1)
+    g.add_edge(3, 5, 8)
+    g.add_edge(4, 5, 4)
+    return g
+
+
+def build_negative_cost_graph():
+    """
+    Builds the graph shared by the all pairs tests: vertices 0, 1, ..., 6 (6 is isolated) and 12 edges, some of
+    them with negative costs, but without negative cost cycles.
+    """
+    g = TripleDictGraph()
+    for vertex in range(7):
+        g.add_vertex(vertex)
+    g.add_edge(0, 1, 4)
+    g.add_edge(0, 3, 3)
+    g.add_edge(1, 2, 5)
+    g.add_edge(1, 4, 4)
+    g.add_edge(2, 1, 5)
+    g.add_edge(2, 5, -2)
+    g.add_edge(3, 0, 4)
+    g.add_edge(3, 4, 3)
+    g.add_edge(4, 1, -3)
+    g.add_edge(4, 3, 3)
+    g.add_edge(4, 5, 2)
+    g.add_edge(5, 2, 4)
+    return g
+
+
 class TestTripleDictGraph(unittest.TestCase):
     def test_read_graph(self):
         graph = read_graph("test_in_graph.txt")
@@ -336,6 +385,316 @@ class TestTripleDictGraph(unittest.TestCase):
         self.assertEqual(walk, [0, 1, 3])
         self.assertEqual(g.calculate_walk_cost(walk), 5)
 
+    def test_forward_dijkstra(self):
+        g = build_small_graph()
+        self.assertEqual(g.dijkstra(0, 5), [0, 1, 3, 4, 5])
+        self.assertEqual(g.dijkstra(2, 2), [2])
+        self.assertRaises(GraphException, g.dijkstra, 5, 0)
+        self.assertRaises(GraphException, g.dijkstra, 0, 9)
+        g.add_edge(5, 0, -1)
+        self.assertRaises(GraphException, g.dijkstra, 0, 5)
+        # Both directions find walks of the same cost
+        random_graph = create_random_graph(40, 120)
+        for start in range(0, 40, 3):
+            for end in range(0, 40, 7):
+                try:
+                    walk = random_graph.reverse_dijkstra(start, end)
+                except GraphException:
+                    self.assertRaises(GraphException, random_graph.dijkstra, start, end)
+                    continue
+                self.assertEqual(random_graph.calculate_walk_cost(random_graph.dijkstra(start, end)),
+                                 random_graph.calculate_walk_cost(walk))
+
+    def test_dial_dijkstra(self):
+        # Small integer costs use Dial's bucket queue, large ones the binary heap; the walks must be identical
+        small, large = TripleDictGraph(40), TripleDictGraph(40)
+        for _ in range(200):
+            _from, _to = random.randrange(40), random.randrange(40)
+            if not small.is_edge_in_graph(_from, _to):
+                cost = random.randint(0, 4)
+                small.add_edge(_from, _to, cost)
+                large.add_edge(_from, _to, cost * (DIAL_MAX_COST + 1))
+        for start in range(0, 40, 3):
+            for end in range(40):
+                try:
+                    walk = large.reverse_dijkstra(start, end)
+                except GraphException:
+                    self.assertRaises(GraphException, small.reverse_dijkstra, start, end)
+                    continue
+                self.assertEqual(small.reverse_dijkstra(start, end), walk)
+        queue = BucketQueue(3)
+        for key, item in [(2, 5), (1, 7), (2.0, 1), (4, 0), (1, 3)]:
+            queue.push(key, item)
+        self.assertEqual(len(queue), 5)
+        self.assertEqual([queue.pop() for _ in range(5)], [(1, 3), (1, 7), (2, 1), (2, 5), (4, 0)])
+        self.assertRaises(IndexError, queue.pop)
+
+    def test_min_cost_walks(self):
+        g = build_small_graph(7)
+        pairs = [(0, 5), (1, 5), (0, 4), (5, 0), (0, 3), (6, 6), (2, 5)]
+        expected = [[0, 1, 3, 4, 5], [1, 3, 4, 5], [0, 1, 3, 4], None, [0, 1, 3], [6], [2, 4, 5]]
+        self.assertEqual(g.min_cost_walks(pairs), expected)
+        self.assertEqual(g.min_cost_walks(pairs, workers=2), expected)
+        self.assertEqual(g.min_cost_walks([]), [])
+        self.assertRaises(GraphException, g.min_cost_walks, [(0, 7)])
+        # Random pairs: the walks have the same costs as the ones of reverse_dijkstra
+        random_graph = create_random_graph(50, 200)
+        pairs = [(random.randrange(50), random.randrange(5)) for _ in range(100)] + \
+                [(random.randrange(5), random.randrange(50)) for _ in range(100)]
+        for (start, end), walk in zip(pairs, random_graph.min_cost_walks(pairs)):
+            try:
+                expected = random_graph.reverse_dijkstra(start, end)
+            except GraphException:
+                self.assertIsNone(walk)
+                continue
+            self.assertEqual((walk[0], walk[-1]), (start, end))
+            self.assertEqual(random_graph.calculate_walk_cost(walk), random_graph.calculate_walk_cost(expected))
+
+    def test_cost_statistics(self):
+        graph = read_graph("test_in_graph.txt")
+        self.assertTrue(graph.has_negative_costs())
+        self.assertTrue(graph.has_integer_costs())
+        self.assertEqual(graph.get_min_cost(), -1)
+        self.assertEqual(graph.get_max_cost(), 8)
+        graph.change_edge_cost(2, 1, 3)
+        self.assertFalse(graph.has_negative_costs())
+        self.assertEqual(graph.get_min_cost(), 1)
+        graph.remove_edge(1, 3)
+        self.assertEqual(graph.get_max_cost(), 7)
+        graph.add_edge(3, 4, 2.5)
+        self.assertFalse(graph.has_integer_costs())
+        graph.remove_vertex(4)
+        self.assertTrue(graph.has_integer_costs())
+        graph.add_edge(3, 0, -4)
+        self.assertTrue(graph.has_negative_costs())
+        self.assertEqual(graph.get_min_cost(), -4)
+        graph.remove_vertex(0)
+        self.assertFalse(graph.has_negative_costs())
+        self.assertEqual((graph.get_min_cost(), graph.get_max_cost()), (2, 5))
+        self.assertIsNone(TripleDictGraph(3).get_min_cost())
+        # The statistics survive copying and agree with the edges
+        random_graph = create_random_graph(20, 60).get_copy_of_graph()
+        costs = [cost for _, _, cost in random_graph.get_all_edges()]
+        self.assertEqual((random_graph.get_min_cost(), random_graph.get_max_cost()), (min(costs), max(costs)))
+
+    def test_bidirectional_dijkstra(self):
+        g = build_small_graph()
+        self.assertEqual(g.bidirectional_dijkstra(0, 5), [0, 1, 3, 4, 5])
+        self.assertEqual(g.bidirectional_dijkstra(0, 1), [0, 1])
+        self.assertEqual(g.bidirectional_dijkstra(3, 3), [3])
+        self.assertRaises(GraphException, g.bidirectional_dijkstra, 5, 0)
+        self.assertRaises(GraphException, g.bidirectional_dijkstra, 0, 9)
+        g.add_edge(5, 0, -1)
+        self.assertRaises(GraphException, g.bidirectional_dijkstra, 0, 5)
+        random_graph = create_random_graph(40, 100)
+        for start in range(0, 40, 3):
+            for end in range(0, 40, 5):
+                try:
+                    walk = random_graph.reverse_dijkstra(start, end)
+                except GraphException:
+                    self.assertRaises(GraphException, random_graph.bidirectional_dijkstra, start, end)
+                    continue
+                other_walk = random_graph.bidirectional_dijkstra(start, end)
+                self.assertEqual((other_walk[0], other_walk[-1]), (start, end))
+                self.assertEqual(random_graph.calculate_walk_cost(other_walk), random_graph.calculate_walk_cost(walk))
+
+    def test_alt_walk(self):
+        g = build_small_graph()
+        # Without an index the search is a plain Dijkstra
+        self.assertEqual(g.alt_walk(0, 5), [0, 1, 3, 4, 5])
+        index = g.build_landmark_index(landmarks=[0, 5])
+        self.assertEqual(index.lower_bound(0, 5), 10)
+        self.assertEqual(index.lower_bound(5, 0), 0)
+        self.assertEqual(g.alt_walk(0, 5), [0, 1, 3, 4, 5])
+        self.assertEqual(g.alt_walk(2, 2), [2])
+        self.assertRaises(GraphException, g.alt_walk, 5, 0)
+        self.assertRaises(GraphException, g.alt_walk, 0, 9)
+        self.assertRaises(GraphException, g.build_landmark_index, landmarks=[9])
+        # The index is saved next to the graph file and loaded back; both files are removed with the directory
+        with tempfile.TemporaryDirectory() as directory:
+            graph_file_name = os.path.join(directory, "test_out_graph.txt")
+            write_graph(g, graph_file_name)
+            index.save(landmark_index_file_name(graph_file_name))
+            loaded = LandmarkIndex.load(landmark_index_file_name(graph_file_name))
+        self.assertEqual((loaded.landmarks, loaded.from_landmark), (index.landmarks, index.from_landmark))
+        g.set_landmark_index(loaded)
+        self.assertEqual(g.alt_walk(0, 4), [0, 1, 3, 4])
+        self.assertRaises(GraphException, TripleDictGraph(3).set_landmark_index, loaded)
+        # The walks have the same cost as the ones of reverse_dijkstra, also after the graph changes
+        random_graph = create_random_graph(50, 150)
+        parallel_index = random_graph.build_landmark_index(4, landmarks=[0, 10, 20, 30], workers=2)
+        self.assertEqual(parallel_index.to_landmark, random_graph.build_landmark_index(landmarks=[0, 10, 20, 30])
+                         .to_landmark)
+        for step in range(2):
+            for start in range(0, 50, 4):
+                for end in range(0, 50, 7):
+                    try:
+                        walk = random_graph.reverse_dijkstra(start, end)
+                    except GraphException:
+                        self.assertRaises(GraphException, random_graph.alt_walk, start, end)
+                        continue
+                    self.assertEqual(random_graph.calculate_walk_cost(random_graph.alt_walk(start, end)),
+                                     random_graph.calculate_walk_cost(walk))
+            for _from, _to, _ in list(random_graph.get_all_edges())[:50]:
+                random_graph.change_edge_cost(_from, _to, 0)
+
+    def test_k_shortest_paths(self):
+        g = build_small_graph(7)
+        g.add_edge(4, 1, 1)
+        paths = g.k_shortest_paths(0, 5, 10)
+        self.assertEqual(paths[:3], [[0, 1, 3, 4, 5], [0, 1, 3, 5], [0, 2, 4, 5]])
+        self.assertEqual([g.calculate_walk_cost(path) for path in paths], [10, 13, 13, 14, 18, 20])
+        self.assertEqual(paths[0], g.reverse_dijkstra(0, 5))
+        # Only loopless paths: the cycle 1 -> 3 -> 4 -> 1 is never used
+        for path in paths:
+            self.assertEqual(len(set(path)), len(path))
+        self.assertEqual(len({tuple(path) for path in paths}), 6)
+        self.assertEqual(g.k_shortest_paths(0, 5, 1), [[0, 1, 3, 4, 5]])
+        self.assertEqual(g.k_shortest_paths(6, 6, 3), [[6]])
+        self.assertRaises(GraphException, g.k_shortest_paths, 5, 0, 2)
+        self.assertRaises(GraphException, g.k_shortest_paths, 0, 7, 2)
+        self.assertRaises(GraphException, g.k_shortest_paths, 0, 5, 0)
+
+    def test_contraction_hierarchy(self):
+        g = build_small_graph()
+        hierarchy = g.build_contraction_hierarchy()
+        self.assertEqual(hierarchy.find_walk(0, 5), [0, 1, 3, 4, 5])
+        self.assertEqual(hierarchy.find_walk(1, 4), [1, 3, 4])
+        self.assertEqual(hierarchy.find_walk(2, 2), [2])
+        self.assertRaises(GraphException, hierarchy.find_walk, 5, 0)
+        self.assertRaises(GraphException, hierarchy.find_walk, 0, 9)
+        g.change_edge_cost(0, 2, 1)
+        self.assertRaises(GraphException, hierarchy.find_walk, 0, 5)
+        g.add_edge(5, 0, -1)
+        self.assertRaises(GraphException, g.build_contraction_hierarchy)
+        # The unpacked walks use edges of the graph and have the same cost as the ones of reverse_dijkstra
+        random_graph = create_random_graph(60, 180)
+        hierarchy = random_graph.build_contraction_hierarchy()
+        for start in range(0, 60, 3):
+            for end in range(0, 60, 4):
+                try:
+                    walk = random_graph.reverse_dijkstra(start, end)
+                except GraphException:
+                    self.assertRaises(GraphException, hierarchy.find_walk, start, end)
+                    continue
+                other_walk = hierarchy.find_walk(start, end)
+                self.assertEqual((other_walk[0], other_walk[-1]), (start, end))
+                self.assertEqual(random_graph.calculate_walk_cost(other_walk), random_graph.calculate_walk_cost(walk))
+
+    def test_shortest_path_tree(self):
+        g = build_small_graph()
+        tree = g.shortest_path_tree(5, "in")
+        self.assertEqual(tree.dist, [10, 7, 9, 5, 4, 0])
+        self.assertEqual(tree.get_walk(0), [0, 1, 3, 4, 5])
+        self.assertEqual(tree.get_walk(0), g.reverse_dijkstra(0, 5))
+        self.assertIs(g.shortest_path_tree(5, "in"), tree)
+        tree = g.shortest_path_tree(1, "out")
+        self.assertEqual(tree.get_cost(5), 7)
+        self.assertEqual(tree.get_walk(5), [1, 3, 4, 5])
+        self.assertRaises(GraphException, tree.get_walk, 0)
+        self.assertRaises(GraphException, tree.get_walk, 9)
+        self.assertGreater(tree.get_cost(0), 10000000)
+        # An uncached tree is computed again and does not replace the cached one
+        uncached = g.shortest_path_tree(1, "out", cache=False)
+        self.assertIsNot(uncached, tree)
+        self.assertEqual(uncached.dist, tree.dist)
+        self.assertIs(g.shortest_path_tree(1, "out"), tree)
+        self.assertRaises(GraphException, g.shortest_path_tree, 9)
+        self.assertRaises(GraphException, g.shortest_path_tree, 0, "up")
+        # Changing the graph gives a new version, so the cached trees are not used anymore
+        version = g.get_version()
+        g.change_edge_cost(0, 2, 0)
+        self.assertNotEqual(g.get_version(), version)
+        self.assertEqual(g.reverse_dijkstra(0, 5), [0, 2, 4, 5])
+        # reverse_dijkstra stores the whole "in" tree of the end in the cache
+        tree = g.shortest_path_tree(5, "in")
+        self.assertEqual(tree.get_walk(0), [0, 2, 4, 5])
+        self.assertEqual(g.reverse_dijkstra(1, 5), [1, 3, 4, 5])
+        self.assertIs(g.shortest_path_tree(5, "in"), tree)
+        g.add_edge(5, 0, -1)
+        self.assertRaises(GraphException, g.shortest_path_tree, 5)
+        # The cached trees give the same walks as searching every time
+        random_graph = create_random_graph(30, 90)
+        for end in range(0, 30, 4):
+            expected = {}
+            for start in range(30):
+                try:
+                    expected[start] = random_graph.reverse_dijkstra(start, end)
+                except GraphException:
+                    expected[start] = None
+            random_graph.shortest_path_tree(end)
+            for start in range(30):
+                if expected[start] is None:
+                    self.assertRaises(GraphException, random_graph.reverse_dijkstra, start, end)
+                else:
+                    self.assertEqual(random_graph.reverse_dijkstra(start, end), expected[start])
+
+    def test_maintain_shortest_path_tree(self):
+        g = build_small_graph()
+        tree = g.maintain_shortest_path_tree(5)
+        self.assertIs(g.maintain_shortest_path_tree(5), tree)
+        self.assertEqual(tree.get_walk(0), [0, 1, 3, 4, 5])
+        # A cheaper edge and a more expensive tree edge (when its subtree is small)
+        g.change_edge_cost(2, 4, 1)
+        self.assertEqual(g.reverse_dijkstra(0, 5), [0, 2, 4, 5])
+        self.assertEqual(tree.no_rebuilds, 1)
+        g.change_edge_cost(4, 5, 20)
+        self.assertEqual(tree.get_walk(0), [0, 1, 3, 5])
+        self.assertEqual(tree.get_cost(2), 21)
+        g.remove_edge(3, 5)
+        self.assertEqual(tree.get_cost(0), 25)
+        self.assertEqual(tree.no_repairs, 2)
+        g.add_vertex(6)
+        self.assertEqual(tree.get_cost(6), INFINITY)
+        self.assertRaises(GraphException, tree.get_walk, 6)
+        g.add_edge(6, 5, 1)
+        self.assertEqual(tree.get_walk(6), [6, 5])
+        # Negative edges make the tree unusable until they are gone
+        g.change_edge_cost(6, 5, -1)
+        self.assertRaises(GraphException, tree.get_walk, 6)
+        g.change_edge_cost(6, 5, 1)
+        self.assertEqual(tree.get_walk(6), [6, 5])
+        g.stop_maintaining_shortest_path_tree(5)
+        self.assertRaises(GraphException, g.stop_maintaining_shortest_path_tree, 5)
+        # Random changes: the maintained trees always have the costs of trees computed from scratch
+        random_graph = create_random_graph(40, 160)
+        trees = [random_graph.maintain_shortest_path_tree(0, "in"), random_graph.maintain_shortest_path_tree(0, "out")]
+        for _ in range(200):
+            _from, _to, _ = random.choice(list(random_graph.get_all_edges()))
+            if random.random() < 0.1:
+                random_graph.remove_edge(_from, _to)
+                _from, _to = random.randrange(40), random.randrange(40)
+                if not random_graph.is_edge_in_graph(_from, _to):
+                    random_graph.add_edge(_from, _to, random.randint(0, MAX_GRAPH_COST))
+            else:
+                random_graph.change_edge_cost(_from, _to, random.randint(0, MAX_GRAPH_COST))
+            for tree in trees:
+                expected = random_graph.get_copy_of_graph().shortest_path_tree(0, tree.direction)
+                for vertex in range(40):
+                    self.assertEqual(tree.get_cost(vertex), expected.get_cost(vertex))
+                    if tree.get_cost(vertex) != INFINITY:
+                        self.assertEqual(random_graph.calculate_walk_cost(tree.get_walk(vertex)),
+                                         tree.get_cost(vertex))
+
+    def test_delta_stepping(self):
+        g = build_small_graph(7)
+        self.assertEqual(g.delta_stepping(0), [0, 3, 4, 5, 6, 10, INFINITY])
+        self.assertEqual(g.delta_stepping(5, "in"), [10, 7, 9, 5, 4, 0, INFINITY])
+        self.assertEqual(g.delta_stepping(5, "in", delta=2), [10, 7, 9, 5, 4, 0, INFINITY])
+        self.assertRaises(GraphException, g.delta_stepping, 7)
+        self.assertRaises(GraphException, g.delta_stepping, 0, "up")
+        g.change_edge_cost(0, 1, -3)
+        self.assertRaises(GraphException, g.delta_stepping, 0)
+        # Random graphs (also with zero and non-integer costs): the costs of shortest_path_tree, for any delta
+        for costs in (lambda: random.randint(0, MAX_GRAPH_COST), lambda: random.randint(0, 2), random.random):
+            random_graph = create_random_graph(60, 300)
+            for _from, _to, _ in list(random_graph.get_all_edges()):
+                random_graph.change_edge_cost(_from, _to, costs())
+            for direction in ("in", "out"):
+                expected = random_graph.shortest_path_tree(0, direction).dist
+                for delta in (None, 0.5, 10, 1000):
+                    self.assertEqual(random_graph.delta_stepping(0, direction, delta), expected)
+
     def test_exist_negative_cost_cycles(self):
         graph = TripleDictGraph(5)
         graph.add_edge(0, 1, -1)
@@ -354,6 +713,37 @@ class TestTripleDictGraph(unittest.TestCase):
         graph.add_edge(3, 0, -1)
         self.assertTrue(graph.exist_negative_cost_cycles(0))
 
+    def test_find_negative_cost_cycle(self):
+        graph = TripleDictGraph(6)
+        graph.add_edge(0, 1, 1)
+        graph.add_edge(1, 2, 4)
+        graph.add_edge(2, 3, -2)
+        graph.add_edge(3, 4, 1)
+        graph.add_edge(4, 5, 1)
+        self.assertIsNone(graph.find_negative_cost_cycle(0))
+        graph.add_edge(4, 2, -1)
+        cycle = graph.find_negative_cost_cycle(0)
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(sorted(cycle[1:]), [2, 3, 4])
+        self.assertEqual(graph.calculate_walk_cost(cycle), -2)
+        # The cycle is not accessible from vertex 5
+        self.assertIsNone(graph.find_negative_cost_cycle(5))
+        self.assertRaises(GraphException, graph.find_negative_cost_cycle, 6)
+        with self.assertRaises(GraphException) as context:
+            graph.bellman(0, 5)
+        self.assertIn("negative cost cycles", str(context.exception))
+        self.assertRaises(GraphException, graph.count_walks_of_minimum_cost, 0, 5)
+        # No negative cycle is found in random graphs with non-negative costs (Bellman-Ford agrees with Dijkstra)
+        random_graph = create_random_graph(40, 150)
+        for end in range(0, 40, 5):
+            try:
+                walk = random_graph.reverse_dijkstra(0, end)
+            except GraphException:
+                self.assertRaises(GraphException, random_graph.bellman, 0, end)
+                continue
+            self.assertEqual(random_graph.calculate_walk_cost(random_graph.bellman(0, end)),
+                             random_graph.calculate_walk_cost(walk))
+
     def test_bellman(self):
         graph = TripleDictGraph(5)
         graph.add_edge(0, 1, -1)
@@ -393,6 +783,88 @@ class TestTripleDictGraph(unittest.TestCase):
         self.assertEqual(walk, [0, 1, 4])
         self.assertEqual(cost, 1)
 
+    def test_vectorized_bellman(self):
+        graph = TripleDictGraph(5)
+        graph.add_edge(0, 1, -1)
+        graph.add_edge(0, 2, 4)
+        graph.add_edge(1, 2, 3)
+        graph.add_edge(1, 3, 2)
+        graph.add_edge(1, 4, 2)
+        graph.add_edge(3, 2, 5)
+        graph.add_edge(3, 1, 1)
+        graph.add_edge(4, 3, -3)
+        for end in range(5):
+            self.assertEqual(graph.bellman(0, end, engine="vectorized"), graph.bellman(0, end))
+        self.assertFalse(graph.exist_negative_cost_cycles(0, engine="vectorized"))
+        self.assertRaises(GraphException, graph.bellman, 2, 0, engine="vectorized")
+        self.assertRaises(GraphException, graph.bellman, 0, 1, engine="numpy")
+        graph.change_edge_cost(3, 1, -0.5)
+        self.assertTrue(graph.exist_negative_cost_cycles(0, engine="vectorized"))
+        self.assertFalse(graph.exist_negative_cost_cycles(2, engine="vectorized"))
+        self.assertRaises(GraphException, graph.bellman, 0, 2, engine="vectorized")
+        # Random graphs with negative edges: both engines agree on the costs and on the negative cycles
+        for _ in range(20):
+            random_graph = create_random_graph(15, 40)
+            for _from, _to, cost in list(random_graph.get_all_edges()):
+                random_graph.change_edge_cost(_from, _to, cost % 7 - 1)
+            self.assertEqual(random_graph.exist_negative_cost_cycles(0, engine="vectorized"),
+                             random_graph.exist_negative_cost_cycles(0))
+            if random_graph.exist_negative_cost_cycles(0):
+                continue
+            for end in range(15):
+                try:
+                    walk = random_graph.bellman(0, end)
+                except GraphException:
+                    self.assertRaises(GraphException, random_graph.bellman, 0, end, engine="vectorized")
+                    continue
+                self.assertEqual(random_graph.calculate_walk_cost(random_graph.bellman(0, end, engine="vectorized")),
+                                 random_graph.calculate_walk_cost(walk))
+
+    def test_all_pairs_shortest_paths(self):
+        g = build_negative_cost_graph()
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "distances.npy")
+            for workers in (None, 2):
+                matrix = g.all_pairs_shortest_paths(file_name, workers)
+                self.assertEqual(matrix.shape, (7, 7))
+                for start in range(7):
+                    for end in range(7):
+                        try:
+                            cost = g.calculate_walk_cost(g.bellman(start, end))
+                        except GraphException:
+                            cost = math.inf
+                        self.assertEqual(matrix[start, end], cost)
+                del matrix
+        # Without a file name the matrix is written in a temporary file which the caller removes
+        matrix = g.all_pairs_shortest_paths()
+        temporary_file_name = matrix.filename
+        self.assertEqual(matrix[0, 5], 6)
+        del matrix
+        self.assertTrue(os.path.exists(temporary_file_name))
+        os.remove(temporary_file_name)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "distances.npy")
+            g.add_edge(5, 4, -1)
+            self.assertRaises(GraphException, g.all_pairs_shortest_paths, file_name)
+
+    def test_floyd_warshall(self):
+        g = build_negative_cost_graph()
+        for block_size in (1, 3, 64):
+            walks = g.floyd_warshall(block_size)
+            self.assertEqual(walks.get_walk(0, 5), [0, 3, 4, 1, 2, 5])
+            self.assertEqual(walks.get_cost(0, 5), 6)
+            self.assertEqual(walks.get_walk(2, 2), [2])
+            self.assertEqual(walks.get_cost(0, 6), INFINITY)
+            self.assertRaises(GraphException, walks.get_walk, 0, 6)
+            self.assertRaises(GraphException, walks.get_walk, 0, 7)
+            for start in range(6):
+                for end in range(6):
+                    walk = walks.get_walk(start, end)
+                    self.assertEqual((walk[0], walk[-1]), (start, end))
+                    self.assertEqual(g.calculate_walk_cost(walk), g.calculate_walk_cost(g.bellman(start, end)))
+        g.add_edge(5, 4, -1)
+        self.assertRaises(GraphException, g.floyd_warshall)
+
     def test_second_time_bellman(self):
         g = TripleDictGraph()
         g.add_vertex(0)
@@ -513,6 +985,27 @@ class TestTripleDictGraph(unittest.TestCase):
         g.add_edge(6, 5, 9)
         self.assertEqual(g.count_walks_of_minimum_cost(0, 5), 2)
 
+    def test_count_walks_of_minimum_cost_on_grid(self):
+        # In a n x n grid with unit costs (edges right and down), the minimum cost walks from the top-left corner to
+        # the bottom-right one are the binomial coefficient C(2(n - 1), n - 1)
+        n = 40
+        g = TripleDictGraph(n * n)
+        for row in range(n):
+            for column in range(n):
+                if column + 1 < n:
+                    g.add_edge(row * n + column, row * n + column + 1, 1)
+                if row + 1 < n:
+                    g.add_edge(row * n + column, (row + 1) * n + column, 1)
+        self.assertEqual(g.count_walks_of_minimum_cost(0, n * n - 1), math.comb(2 * (n - 1), n - 1))
+        self.assertEqual(g.count_walks_of_minimum_cost(0, n * n - 1, modulo=10 ** 9 + 7),
+                         math.comb(2 * (n - 1), n - 1) % (10 ** 9 + 7))
+        self.assertEqual(g.count_walks_of_minimum_cost(n - 1, n * n - 1), 1)
+        # A zero cost cycle on the minimum cost walks makes their number infinite
+        g.add_edge(n + 1, 1, 0)
+        g.change_edge_cost(1, n + 1, 0)
+        self.assertRaises(GraphException, g.count_walks_of_minimum_cost, 0, n * n - 1)
+        self.assertEqual(g.count_walks_of_minimum_cost(0, n), 1)
+
     def test_get_copy_of_graph(self):
         graph = read_graph("test_in_graph.txt")
         copy = graph.get_copy_of_graph()
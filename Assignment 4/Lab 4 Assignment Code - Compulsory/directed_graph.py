@@ -1,3 +1,4 @@
+import heapq
 import random
 
 from copy import deepcopy
@@ -6,10 +7,52 @@ import graphviz
 import numpy
 
 from errors import GraphException
-from queue import PriorityQueue
 
 MAX_GRAPH_COST = 100  # We use this for the costs of the randomly generated graphs
 INFINITY = 999999999999999  # We use this to define the default value used as infinity
+DIAL_MAX_COST = 1000  # The largest edge cost for which Prim's Algorithm uses a bucket queue instead of a heap
+
+
+class BucketQueue:
+    def __init__(self, max_cost):
+        """
+        A priority queue for non-negative integer keys which never differ by more than <max_cost> (Dial's bucket
+        queue): a circular array of max_cost + 1 buckets, the key k being kept in the bucket k % (max_cost + 1).
+        Popping scans the buckets from the smallest key that may be in the queue. The items of a bucket are kept in
+        a small heap, so the items with the same key are popped in the same order as from a binary heap of
+        (key, item) pairs.
+        :param max_cost: The largest difference between 2 keys of the queue; int
+        """
+        self.__buckets = [[] for _ in range(max_cost + 1)]
+        self.__size = 0
+        self.__current = 0  # No key in the queue is smaller than this one
+
+    def __len__(self):
+        return self.__size
+
+    def push(self, key, item):
+        """
+        Adds the given item with the given key (an integer) to the queue.
+        """
+        if self.__size == 0 or key < self.__current:
+            self.__current = key
+        heapq.heappush(self.__buckets[key % len(self.__buckets)], item)
+        self.__size += 1
+
+    def pop(self):
+        """
+        Removes the item with the smallest key (the smallest item among those with that key) from the queue.
+        :return: A pair (key, item)
+        :raise: IndexError - if the queue is empty
+        """
+        if self.__size == 0:
+            raise IndexError("pop from an empty bucket queue")
+        buckets, current = self.__buckets, self.__current
+        while not buckets[current % len(buckets)]:
+            current += 1
+        self.__current = current
+        self.__size -= 1
+        return current, heapq.heappop(buckets[current % len(buckets)])
 
 
 class UndirectedGraph:
@@ -239,13 +282,26 @@ class UndirectedGraph:
     def prim_algorithm(self, start):
         """
         Find the minimum spanning tree (MST) of the graph starting from the given vertex <start> using
-        Prim's Algorithm.
+        Prim's Algorithm. The candidate edges are kept in a plain binary heap (heapq) or, if all the costs are
+        integers between 0 and DIAL_MAX_COST, in a bucket queue (the candidates come out in the same order, so the
+        result is the same). The costs of the edges are read directly from the cost dictionary.
         :param start: The vertex where we want Prim's Algorithm to start from; integer
         :return: The edges from the minimum spanning tree; list of pairs representing the edges: (_from, _to)
         """
         if not self.is_vertex_in_graph(start):
             raise GraphException(f"The vertex {start} does not exist in the graph.")
-        q = PriorityQueue()
+        cost_of = self.__cost
+        if all(isinstance(cost, int) and 0 <= cost <= DIAL_MAX_COST for cost in cost_of.values()):
+            q = BucketQueue(max(cost_of.values(), default=0))
+            push, pop = q.push, q.pop
+        else:
+            q = []
+
+            def push(cost, vertex):
+                heapq.heappush(q, (cost, vertex))
+
+            def pop():
+                return heapq.heappop(q)
         prev = {node: None for node in self.get_all_vertices()}
         dist = {node: numpy.inf for node in self.get_all_vertices()}
         processed = {node: False for node in self.get_all_vertices()}
@@ -254,20 +310,26 @@ class UndirectedGraph:
         dist[start] = 0
         processed[start] = True
 
-        for neighbour in self.get_neighbours(start):
-            dist[neighbour] = self.get_cost_of_edge(start, neighbour)
+        for neighbour in self.__neighbours[start]:
+            # Every edge is stored only once, in the orientation it was added with
+            cost = cost_of[(start, neighbour)] if (start, neighbour) in cost_of else cost_of[(neighbour, start)]
+            dist[neighbour] = cost
             prev[neighbour] = start
-            q.put((dist[neighbour], neighbour))
-        while not q.empty():
-            top = q.get()
+            push(cost, neighbour)
+        while q:
+            top = pop()
             top_vertex = top[1]
             if not processed[top_vertex]:
                 tree_edges.append((prev[top_vertex], top_vertex))
                 processed[top_vertex] = True
-                for neighbour in self.get_neighbours(top_vertex):
-                    if not processed[neighbour] and self.get_cost_of_edge(top_vertex, neighbour) < dist[neighbour]:
-                        dist[neighbour] = self.get_cost_of_edge(top_vertex, neighbour)
-                        q.put((dist[neighbour], neighbour))
+                for neighbour in self.__neighbours[top_vertex]:
+                    if processed[neighbour]:
+                        continue
+                    cost = cost_of[(top_vertex, neighbour)] if (top_vertex, neighbour) in cost_of \
+                        else cost_of[(neighbour, top_vertex)]
+                    if cost < dist[neighbour]:
+                        dist[neighbour] = cost
+                        push(cost, neighbour)
                         prev[neighbour] = top_vertex
         return tree_edges
 
@@ -1,6 +1,7 @@
+import random
 import unittest
 
-from directed_graph import read_graph, create_random_graph, write_graph, UndirectedGraph
+from directed_graph import read_graph, create_random_graph, write_graph, UndirectedGraph, BucketQueue, DIAL_MAX_COST
 from errors import GraphException
 
 
@@ -304,3 +305,20 @@ class TestTripleDictGraph(unittest.TestCase):
         for start_vertex, end_vertex in mst_edges:
             total_cost += graph.get_cost_of_edge(start_vertex, end_vertex)
         self.assertEqual(total_cost, 37)
+
+    def test_prim_algorithm_bucket_queue(self):
+        # Small integer costs use the bucket queue, large ones the binary heap; the trees must be identical
+        small, large = UndirectedGraph(40), UndirectedGraph(40)
+        for _ in range(150):
+            _from, _to = random.randrange(40), random.randrange(40)
+            if _from != _to and not small.is_edge_in_graph(_from, _to):
+                cost = random.randint(0, 5)
+                small.add_edge(_from, _to, cost)
+                large.add_edge(_from, _to, cost * (DIAL_MAX_COST + 1))
+        for start in range(40):
+            self.assertEqual(small.prim_algorithm(start), large.prim_algorithm(start))
+        queue = BucketQueue(3)
+        for key, item in [(2, 5), (1, 7), (2, 1), (4, 0), (1, 3)]:
+            queue.push(key, item)
+        self.assertEqual([queue.pop() for _ in range(5)], [(1, 3), (1, 7), (2, 1), (2, 5), (4, 0)])
+        self.assertRaises(IndexError, queue.pop)